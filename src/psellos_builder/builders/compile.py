@@ -1,20 +1,166 @@
 """Pipeline orchestration for building dataset artifacts."""
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
+from typing import Any
 
 from psellos_builder.builders.manifest import build_manifest
-from psellos_builder.exporters.dist_writer import write_dist
-from psellos_builder.validators.schema import validate_schema
-
-
-def compile_dataset(*, spec_path: Path, input_path: Path, dist_path: Path) -> None:
-    """Run the build pipeline for validation and dist output."""
-    dataset = validate_schema(spec_path=spec_path, input_path=input_path)
-    manifest = build_manifest(dataset, spec_path=spec_path, input_path=input_path)
-    write_dist(
-        dist_path=dist_path,
-        manifest=manifest,
-        dataset=dataset,
-        input_path=input_path,
+from psellos_builder.exporters.artifacts import BackgroundArtifactWriter
+from psellos_builder.exporters.dist_writer import MANIFEST_NAME, write_dist
+from psellos_builder.loaders import STDIN_PATH, process_pool
+from psellos_builder.validators.schema import (
+    load_dataset,
+    validate_dataset,
+    validate_schema,
+)
+
+
+def _staging_path(dist_path: Path) -> Path:
+    return dist_path.parent / f".{dist_path.name}.staging"
+
+
+def _promote_staging(staging_path: Path, dist_path: Path) -> None:
+    # Move every artifact into place before the manifest that points at them.
+    files = sorted(
+        (path for path in staging_path.rglob("*") if path.is_file()),
+        key=lambda path: (path == staging_path / MANIFEST_NAME, path),
     )
+    for path in files:
+        target = dist_path / path.relative_to(staging_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+    shutil.rmtree(staging_path)
+
+
+def _validate_input(spec_path: Path, input_path: Path) -> None:
+    # Runs in a separate process that loads the input itself, so only the
+    # outcome (not the dataset) crosses the process boundary. It loads with a
+    # single worker so it does not start a second pool next to the builder's.
+    validate_schema(spec_path=spec_path, input_path=input_path, workers=1)
+
+
+def _compile_pipelined(
+    *,
+    spec_path: Path,
+    input_path: Path,
+    dist_path: Path,
+    workers: int | None,
+    dist_options: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    from concurrent.futures import Executor, ThreadPoolExecutor
+
+    if not spec_path.exists():
+        raise FileNotFoundError(f"Spec path not found: {spec_path}")
+    staging_path = _staging_path(dist_path)
+    shutil.rmtree(staging_path, ignore_errors=True)
+
+    # stdin can only be read once, so its loaded copy is validated on a thread.
+    reads_stdin = input_path == STDIN_PATH
+    executor: Executor = (
+        ThreadPoolExecutor(max_workers=1)
+        if reads_stdin
+        else process_pool(1)
+    )
+    with executor:
+        if reads_stdin:
+            dataset = load_dataset(input_path, workers=workers)
+            validation = executor.submit(
+                validate_dataset, dataset, spec_path=spec_path
+            )
+        else:
+            validation = executor.submit(_validate_input, spec_path, input_path)
+        try:
+            if not reads_stdin:
+                dataset = load_dataset(input_path, workers=workers)
+            manifest = build_manifest(
+                dataset, spec_path=spec_path, input_path=input_path
+            )
+            writer = BackgroundArtifactWriter(staging_path)
+            try:
+                write_dist(
+                    dist_path=staging_path,
+                    manifest=manifest,
+                    dataset=dataset,
+                    input_path=input_path,
+                    workers=workers,
+                    writer=writer,
+                    **dist_options,
+                )
+            except BaseException:
+                writer.abort()
+                raise
+            writer.close()
+            validation.result()
+        except BaseException as exc:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            if isinstance(exc, Exception):
+                # A schema error explains a failed build better than its symptom.
+                error = validation.exception()
+                if error is not None and error is not exc:
+                    raise error from None
+            raise
+    _promote_staging(staging_path, dist_path)
+    return dataset, manifest
+
+
+def compile_dataset(
+    *,
+    spec_path: Path,
+    input_path: Path,
+    dist_path: Path,
+    search_index: bool = False,
+    page_size: int | None = None,
+    workers: int | None = None,
+    ndjson: bool = False,
+    sqlite_path: Path | None = None,
+    content_addressed: bool = False,
+    index_memory_budget: int | None = None,
+    person_cards: bool = False,
+    projection: str = "full",
+    pipelined: bool = False,
+) -> None:
+    """Run the build pipeline for validation and dist output.
+
+    With ``pipelined``, schema validation runs in its own process while the
+    artifacts are built into a staging directory, with file hashing and writes
+    on background threads. Staged artifacts replace those in ``dist_path``
+    (``manifest.json`` last) only after validation passes; any failure removes
+    the staging directory and leaves ``dist_path`` untouched. The validation
+    process parses its own copy of the input, so peak memory roughly doubles.
+    """
+    dist_options: dict[str, Any] = {
+        "search_index": search_index,
+        "page_size": page_size,
+        "ndjson": ndjson,
+        "content_addressed": content_addressed,
+        "index_memory_budget": index_memory_budget,
+        "person_cards": person_cards,
+        "projection": projection,
+    }
+    if pipelined:
+        dataset, manifest = _compile_pipelined(
+            spec_path=spec_path,
+            input_path=input_path,
+            dist_path=dist_path,
+            workers=workers,
+            dist_options=dist_options,
+        )
+    else:
+        dataset = validate_schema(
+            spec_path=spec_path, input_path=input_path, workers=workers
+        )
+        manifest = build_manifest(dataset, spec_path=spec_path, input_path=input_path)
+        write_dist(
+            dist_path=dist_path,
+            manifest=manifest,
+            dataset=dataset,
+            input_path=input_path,
+            workers=workers,
+            **dist_options,
+        )
+    if sqlite_path is not None:
+        from psellos_builder.exporters.sqlite_writer import write_sqlite
+
+        write_sqlite(db_path=sqlite_path, manifest=manifest, dataset=dataset)
@@ -0,0 +1,164 @@
+"""External-memory person index building with sorted on-disk runs."""
+from __future__ import annotations
+
+import heapq
+import json
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+# Rough per-entry cost of a buffered (person, layer, assertion id) tuple:
+# the tuple itself plus three str headers.
+ENTRY_OVERHEAD_BYTES = 220
+# Most run files open at once in one merge, well below common open-file limits.
+MAX_MERGE_FAN_IN = 64
+
+IndexEntry = tuple[str, str, str]
+
+
+def _read_run(path: Path) -> Iterator[IndexEntry]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            person_id, layer, assertion_id = json.loads(line)
+            yield person_id, layer, assertion_id
+
+
+def _write_run(path: Path, entries: Iterable[IndexEntry]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        previous = None
+        for entry in entries:
+            if entry != previous:
+                handle.write(json.dumps(entry))
+                handle.write("\n")
+                previous = entry
+
+
+class ExternalPersonIndex:
+    """Accumulate person index entries under a memory budget, spilling sorted runs.
+
+    Entries are buffered until their estimated size exceeds ``memory_budget``
+    bytes, then sorted, de-duplicated, and written to a run file. ``iter_sorted``
+    k-way merges the runs with ``heapq.merge``, first merging groups of
+    ``MAX_MERGE_FAN_IN`` runs into intermediate runs while there are more, so
+    the number of open files stays bounded.
+    """
+
+    def __init__(self, *, memory_budget: int) -> None:
+        if memory_budget < 1:
+            raise ValueError(f"Memory budget must be positive: {memory_budget}")
+        self._memory_budget = memory_budget
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="psellos-index-")
+        self._buffer: list[IndexEntry] = []
+        self._buffered_bytes = 0
+        self._run_count = 0
+        self.runs: list[Path] = []
+
+    def __enter__(self) -> ExternalPersonIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer = []
+        self._temp_dir.cleanup()
+
+    def add(self, person_id: str, layer: str, assertion_id: str) -> None:
+        self._buffer.append((person_id, layer, assertion_id))
+        self._buffered_bytes += (
+            len(person_id) + len(layer) + len(assertion_id) + ENTRY_OVERHEAD_BYTES
+        )
+        if self._buffered_bytes >= self._memory_budget:
+            self._spill()
+
+    def _next_run_path(self) -> Path:
+        path = Path(self._temp_dir.name) / f"run-{self._run_count:05d}.ndjson"
+        self._run_count += 1
+        return path
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+        path = self._next_run_path()
+        _write_run(path, sorted(self._buffer))
+        self.runs.append(path)
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _reduce_runs(self) -> None:
+        while len(self.runs) > MAX_MERGE_FAN_IN:
+            merged: list[Path] = []
+            for start in range(0, len(self.runs), MAX_MERGE_FAN_IN):
+                group = self.runs[start : start + MAX_MERGE_FAN_IN]
+                if len(group) == 1:
+                    merged.extend(group)
+                    continue
+                path = self._next_run_path()
+                _write_run(path, heapq.merge(*(_read_run(run) for run in group)))
+                for run in group:
+                    run.unlink()
+                merged.append(path)
+            self.runs = merged
+
+    def iter_sorted(self) -> Iterator[IndexEntry]:
+        """Yield unique entries in (person, layer, assertion id) order."""
+        self._spill()
+        self._reduce_runs()
+        previous = None
+        for entry in heapq.merge(*(_read_run(path) for path in self.runs)):
+            if entry != previous:
+                yield entry
+                previous = entry
+
+
+def _object_member(key: str, value: object) -> str:
+    # Render one member exactly as json.dump(..., sort_keys=True, indent=2)
+    # renders it inside the top-level object.
+    rendered = json.dumps({key: value}, sort_keys=True, indent=2)
+    return rendered[2:-2]
+
+
+class _ObjectStreamWriter:
+    def __init__(self, handle: TextIO) -> None:
+        self._handle = handle
+        self._count = 0
+
+    def add(self, key: str, value: object) -> None:
+        self._handle.write("{\n" if self._count == 0 else ",\n")
+        self._handle.write(_object_member(key, value))
+        self._count += 1
+
+    def close(self) -> None:
+        self._handle.write("\n}\n" if self._count else "{}\n")
+
+
+def write_person_indexes(
+    entries: Iterator[IndexEntry],
+    *,
+    by_person_handle: TextIO,
+    by_person_by_layer_handle: TextIO,
+) -> dict[str, int]:
+    """Stream sorted entries into both person index artifacts.
+
+    Output is byte-identical to ``json.dump(index, sort_keys=True, indent=2)``
+    followed by a newline. Returns the number of persons per layer.
+    """
+    by_person = _ObjectStreamWriter(by_person_handle)
+    by_person_by_layer = _ObjectStreamWriter(by_person_by_layer_handle)
+    person_count_by_layer: dict[str, int] = {}
+    for person_id, person_entries in groupby(entries, key=itemgetter(0)):
+        layers: dict[str, list[str]] = {}
+        for _, layer, assertion_id in person_entries:
+            layers.setdefault(layer, []).append(assertion_id)
+        by_person.add(
+            person_id,
+            sorted({aid for assertion_ids in layers.values() for aid in assertion_ids}),
+        )
+        by_person_by_layer.add(person_id, layers)
+        for layer in layers:
+            person_count_by_layer[layer] = person_count_by_layer.get(layer, 0) + 1
+    by_person.close()
+    by_person_by_layer.close()
+    return person_count_by_layer
@@ -0,0 +1,104 @@
+"""Referential integrity checks collected while assertion indexes are built."""
+from __future__ import annotations
+
+from typing import Any, Collection
+
+MAX_INTEGRITY_SAMPLES = 20
+
+
+class _Finding:
+    __slots__ = ("count", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.samples: list[Any] = []
+
+    def add(self, sample: Any) -> None:
+        self.count += 1
+        if len(self.samples) < MAX_INTEGRITY_SAMPLES:
+            self.samples.append(sample)
+
+    def summary(self) -> dict[str, Any]:
+        return {"count": self.count, "samples": self.samples}
+
+
+class IntegrityChecker:
+    """Detect duplicate ids, dangling endpoints, and unknown layers in one pass.
+
+    The index builders call ``add`` once per assertion with a string id,
+    passing whether the id was already indexed, so the checks share the
+    persons and assertions id sets the build already keeps. For sharded
+    inputs, ``duplicate_sources`` maps repeated assertion ids to the shard
+    paths that define them.
+    """
+
+    def __init__(
+        self,
+        person_ids: Collection[str],
+        *,
+        duplicate_sources: dict[str, list[str]] | None = None,
+    ) -> None:
+        self._person_ids = person_ids
+        self._duplicate_sources = duplicate_sources or {}
+        self._assertion_count = 0
+        self._duplicates = _Finding()
+        self._dangling = _Finding()
+        self._layer_counts: dict[str, int] = {}
+
+    def add(
+        self,
+        assertion: dict[str, Any],
+        *,
+        assertion_id: str,
+        layer: str,
+        duplicate: bool,
+    ) -> None:
+        if duplicate:
+            self._duplicates.add(assertion_id)
+        else:
+            self._assertion_count += 1
+        layer_counts = self._layer_counts
+        layer_counts[layer] = layer_counts.get(layer, 0) + 1
+        person_ids = self._person_ids
+        subject = assertion.get("subject")
+        object_ = assertion.get("object")
+        if (subject is None or subject in person_ids) and (
+            object_ is None or object_ in person_ids
+        ):
+            return
+        for role, person_id in (("subject", subject), ("object", object_)):
+            if person_id is not None and person_id not in person_ids:
+                self._dangling.add(
+                    {"assertion_id": assertion_id, "role": role, "person_id": person_id}
+                )
+
+    def report(self, layers_meta: dict[str, Any] | None) -> dict[str, Any]:
+        """Return the integrity report; layers are checked only with metadata.
+
+        ``unknown_layers`` counts the distinct layer ids missing from
+        ``layers_meta`` and, in ``assertion_count``, the records that use them.
+        """
+        duplicates = self._duplicates.summary()
+        duplicates["sources"] = {
+            assertion_id: self._duplicate_sources[assertion_id]
+            for assertion_id in duplicates["samples"]
+            if assertion_id in self._duplicate_sources
+        }
+        unknown: list[str] = []
+        if layers_meta is not None:
+            known = {entry["id"] for entry in layers_meta["layers"]}
+            unknown = [
+                layer for layer in sorted(self._layer_counts) if layer not in known
+            ]
+        return {
+            "person_count": len(self._person_ids),
+            "assertion_count": self._assertion_count,
+            "layers_meta_checked": layers_meta is not None,
+            "duplicate_assertion_ids": duplicates,
+            "dangling_endpoints": self._dangling.summary(),
+            "unknown_layers": {
+                "count": len(unknown),
+                "assertion_count": sum(self._layer_counts[layer] for layer in unknown),
+                "samples": unknown[:MAX_INTEGRITY_SAMPLES],
+            },
+        }
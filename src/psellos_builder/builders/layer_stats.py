@@ -0,0 +1,285 @@
+"""Per-layer statistics for layer_stats.json, sequential or in a process pool."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from psellos_builder.layers import get_rel_type
+from psellos_builder.loaders import process_pool, resolve_workers
+
+MAX_TOP_PERSONS = 20
+# Below this many assertions, process start-up outweighs the per-layer work.
+PARALLEL_STATS_MIN_ASSERTIONS = 50_000
+
+
+def _increment_rel_counts(
+    counts: dict[str, int], assertion: dict[str, Any]
+) -> None:
+    rel_type = get_rel_type(assertion)
+    counts[rel_type] = counts.get(rel_type, 0) + 1
+
+
+def increment_person_counts(
+    counts: dict[str, int], assertion: dict[str, Any]
+) -> None:
+    """Count the string subject and object of an assertion."""
+    subject = assertion.get("subject")
+    if isinstance(subject, str):
+        counts[subject] = counts.get(subject, 0) + 1
+    obj = assertion.get("object")
+    if isinstance(obj, str):
+        counts[obj] = counts.get(obj, 0) + 1
+
+
+def top_persons(counts: dict[str, int]) -> list[dict[str, Any]]:
+    """Return the most counted persons, ranked by count then id."""
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return [
+        {"personId": person_id, "count": count}
+        for person_id, count in ranked[:MAX_TOP_PERSONS]
+    ]
+
+
+def count_persons_by_layer(
+    assertions_by_person_by_layer: dict[str, dict[str, list[str]]],
+) -> dict[str, int]:
+    """Return the number of persons with at least one assertion in each layer."""
+    counts: dict[str, int] = {}
+    for layers in assertions_by_person_by_layer.values():
+        for layer in layers:
+            counts[layer] = counts.get(layer, 0) + 1
+    return counts
+
+
+def _build_layer_stats(
+    *,
+    assertions_by_layer: dict[str, list[str]],
+    person_counts_by_layer: dict[str, int],
+    assertions_by_id: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    layer_ids = sorted(assertions_by_layer.keys())
+    assertion_count_by_layer = {
+        layer: len(assertions_by_layer[layer]) for layer in layer_ids
+    }
+    person_count_by_layer = {
+        layer: person_counts_by_layer.get(layer, 0) for layer in layer_ids
+    }
+
+    rel_count_by_layer: dict[str, dict[str, int]] = {
+        layer: {} for layer in layer_ids
+    }
+    top_persons_by_layer: dict[str, list[dict[str, Any]]] = {}
+    for layer in layer_ids:
+        person_counts: dict[str, int] = {}
+        for assertion_id in assertions_by_layer[layer]:
+            assertion = assertions_by_id.get(assertion_id)
+            if not assertion:
+                continue
+            _increment_rel_counts(rel_count_by_layer[layer], assertion)
+            increment_person_counts(person_counts, assertion)
+        top_persons_by_layer[layer] = top_persons(person_counts)
+        rel_count_by_layer[layer] = dict(
+            sorted(rel_count_by_layer[layer].items())
+        )
+
+    compare_to_canon: dict[str, dict[str, Any]] = {}
+    canon_set = set(assertions_by_layer.get("canon", []))
+    for layer in layer_ids:
+        if layer == "canon":
+            continue
+        layer_set = set(assertions_by_layer[layer])
+        added = sorted(layer_set - canon_set)
+        removed = sorted(canon_set - layer_set)
+        added_person_counts: dict[str, int] = {}
+        removed_person_counts: dict[str, int] = {}
+        added_rel_counts: dict[str, int] = {}
+        removed_rel_counts: dict[str, int] = {}
+        for assertion_id in added:
+            assertion = assertions_by_id.get(assertion_id)
+            if not assertion:
+                continue
+            increment_person_counts(added_person_counts, assertion)
+            _increment_rel_counts(added_rel_counts, assertion)
+        for assertion_id in removed:
+            assertion = assertions_by_id.get(assertion_id)
+            if not assertion:
+                continue
+            increment_person_counts(removed_person_counts, assertion)
+            _increment_rel_counts(removed_rel_counts, assertion)
+        compare_to_canon[layer] = {
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "added_persons_topN": top_persons(added_person_counts),
+            "removed_persons_topN": top_persons(removed_person_counts),
+            "added_rel_count_by_type": dict(sorted(added_rel_counts.items())),
+            "removed_rel_count_by_type": dict(sorted(removed_rel_counts.items())),
+        }
+
+    return {
+        "assertion_count_by_layer": assertion_count_by_layer,
+        "person_count_by_layer": person_count_by_layer,
+        "rel_count_by_layer": rel_count_by_layer,
+        "top_persons_by_layer": top_persons_by_layer,
+        "compare_to_canon": compare_to_canon,
+    }
+
+
+class _SharedAssertions:
+    """Read-only assertion metadata as interned string tables and int arrays."""
+
+    __slots__ = ("person_ids", "rel_types", "subjects", "objects", "rels", "layers")
+
+    def __init__(
+        self,
+        *,
+        assertions_by_layer: dict[str, list[str]],
+        assertions_by_id: dict[str, dict[str, Any]],
+    ) -> None:
+        person_index: dict[str, int] = {}
+        rel_index: dict[str, int] = {}
+        assertion_index: dict[str, int] = {}
+        self.subjects = array("l")
+        self.objects = array("l")
+        self.rels = array("l")
+        for assertion_id, assertion in assertions_by_id.items():
+            assertion_index[assertion_id] = len(self.rels)
+            for role, column in (("subject", self.subjects), ("object", self.objects)):
+                person_id = assertion.get(role)
+                if isinstance(person_id, str):
+                    column.append(person_index.setdefault(person_id, len(person_index)))
+                else:
+                    column.append(-1)
+            rel_type = get_rel_type(assertion)
+            self.rels.append(rel_index.setdefault(rel_type, len(rel_index)))
+        self.person_ids = list(person_index)
+        self.rel_types = list(rel_index)
+        self.layers = {
+            layer: array(
+                "l",
+                (
+                    assertion_index[assertion_id]
+                    for assertion_id in assertion_ids
+                    if assertion_id in assertion_index
+                ),
+            )
+            for layer, assertion_ids in assertions_by_layer.items()
+        }
+
+    def counts(self, members: Any) -> tuple[dict[str, int], list[dict[str, Any]]]:
+        rel_counts: dict[int, int] = {}
+        person_counts: dict[int, int] = {}
+        subjects, objects, rels = self.subjects, self.objects, self.rels
+        for index in members:
+            rel_counts[rels[index]] = rel_counts.get(rels[index], 0) + 1
+            for person in (subjects[index], objects[index]):
+                if person >= 0:
+                    person_counts[person] = person_counts.get(person, 0) + 1
+        return (
+            dict(
+                sorted(
+                    (self.rel_types[rel], count) for rel, count in rel_counts.items()
+                )
+            ),
+            top_persons(
+                {
+                    self.person_ids[person]: count
+                    for person, count in person_counts.items()
+                }
+            ),
+        )
+
+
+_SHARED: _SharedAssertions | None = None
+
+
+def _init_stats_worker(shared: _SharedAssertions) -> None:
+    global _SHARED
+    _SHARED = shared
+
+
+def _layer_stats_task(layer: str) -> tuple[str, Any, Any, Any]:
+    shared = _SHARED
+    assert shared is not None
+    rel_counts, top_persons = shared.counts(shared.layers[layer])
+    if layer == "canon":
+        return layer, rel_counts, top_persons, None
+    layer_set = set(shared.layers[layer])
+    canon_set = set(shared.layers.get("canon", ()))
+    added = layer_set - canon_set
+    removed = canon_set - layer_set
+    added_rels, added_persons = shared.counts(added)
+    removed_rels, removed_persons = shared.counts(removed)
+    compare = {
+        "added_count": len(added),
+        "removed_count": len(removed),
+        "added_persons_topN": added_persons,
+        "removed_persons_topN": removed_persons,
+        "added_rel_count_by_type": added_rels,
+        "removed_rel_count_by_type": removed_rels,
+    }
+    return layer, rel_counts, top_persons, compare
+
+
+def _build_layer_stats_parallel(
+    *,
+    assertions_by_layer: dict[str, list[str]],
+    person_counts_by_layer: dict[str, int],
+    assertions_by_id: dict[str, dict[str, Any]],
+    workers: int,
+) -> dict[str, Any]:
+    layer_ids = sorted(assertions_by_layer.keys())
+    shared = _SharedAssertions(
+        assertions_by_layer=assertions_by_layer, assertions_by_id=assertions_by_id
+    )
+    with process_pool(
+        workers, initializer=_init_stats_worker, initargs=(shared,)
+    ) as executor:
+        results = list(executor.map(_layer_stats_task, layer_ids))
+
+    rel_count_by_layer: dict[str, dict[str, int]] = {}
+    top_persons_by_layer: dict[str, list[dict[str, Any]]] = {}
+    compare_to_canon: dict[str, dict[str, Any]] = {}
+    for layer, rel_counts, top_persons, compare in results:
+        rel_count_by_layer[layer] = rel_counts
+        top_persons_by_layer[layer] = top_persons
+        if compare is not None:
+            compare_to_canon[layer] = compare
+    return {
+        "assertion_count_by_layer": {
+            layer: len(assertions_by_layer[layer]) for layer in layer_ids
+        },
+        "person_count_by_layer": {
+            layer: person_counts_by_layer.get(layer, 0) for layer in layer_ids
+        },
+        "rel_count_by_layer": rel_count_by_layer,
+        "top_persons_by_layer": top_persons_by_layer,
+        "compare_to_canon": compare_to_canon,
+    }
+
+
+def build_layer_stats(
+    *,
+    assertions_by_layer: dict[str, list[str]],
+    person_counts_by_layer: dict[str, int],
+    assertions_by_id: dict[str, dict[str, Any]],
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """Return layer_stats.json, farming per-layer work out to worker processes.
+
+    Workers receive assertion metadata once, through the pool initializer, as
+    interned person/rel tables plus int arrays. Small datasets and single-worker
+    runs use the sequential path; both produce identical output.
+    """
+    worker_count = resolve_workers(workers, len(assertions_by_layer))
+    if worker_count == 1 or len(assertions_by_id) < PARALLEL_STATS_MIN_ASSERTIONS:
+        return _build_layer_stats(
+            assertions_by_layer=assertions_by_layer,
+            person_counts_by_layer=person_counts_by_layer,
+            assertions_by_id=assertions_by_id,
+        )
+    return _build_layer_stats_parallel(
+        assertions_by_layer=assertions_by_layer,
+        person_counts_by_layer=person_counts_by_layer,
+        assertions_by_id=assertions_by_id,
+        workers=worker_count,
+    )
@@ -3,13 +3,13 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from importlib.metadata import PackageNotFoundError, version
 from typing import Any
 
 from psellos_builder.validators.schema import SPEC_VERSION
 
 
-def _resolve_person_display_name(person: dict[str, Any], person_id: str) -> str:
+def resolve_person_display_name(person: dict[str, Any], person_id: str) -> str:
+    """Return ``name``, else ``label``, the first ``names`` entry, or the id."""
     name = person.get("name")
     if isinstance(name, str):
         return name
@@ -32,6 +32,9 @@ def _resolve_person_display_name(person: dict[str, Any], person_id: str) -> str:
 
 
 def _resolve_builder_version() -> str:
+    # importlib.metadata is slow to import; only pay for it when building.
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
         return version("psellos-builder")
     except PackageNotFoundError:
@@ -65,16 +68,18 @@ def _derive_spec_version(spec_path: Path) -> str:
 def build_manifest(
     dataset: dict[str, Any], *, spec_path: Path, input_path: Path
 ) -> dict[str, Any]:
-    """Build the deterministic manifest JSON payload."""
+    """Build the deterministic manifest JSON payload.
+
+    Duplicate person ids are rejected by ``write_dist``, which keys persons
+    while writing ``persons.json``.
+    """
     persons = dataset.get("persons", [])
     assertions = dataset.get("assertions", [])
 
     person_index: dict[str, str] = {}
     for person in sorted(persons, key=lambda entry: entry["id"]):
         person_id = person["id"]
-        if person_id in person_index:
-            raise ValueError(f"Duplicate person id detected: {person_id}")
-        person_index[person_id] = _resolve_person_display_name(person, person_id)
+        person_index[person_id] = resolve_person_display_name(person, person_id)
 
     manifest = {
         "spec_version": _derive_spec_version(spec_path),
@@ -0,0 +1,76 @@
+"""Compact per-person summary cards, sharded by id hash."""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable
+
+from psellos_builder.builders.manifest import resolve_person_display_name
+
+CARD_SHARD_PREFIX_LENGTH = 2
+MAX_CO_OCCURRING_PERSONS = 10
+
+
+def card_shard_key(person_id: str) -> str:
+    """Return the shard key (leading sha1 hex digits) for a person id."""
+    digest = hashlib.sha1(person_id.encode("utf-8")).hexdigest()
+    return digest[:CARD_SHARD_PREFIX_LENGTH]
+
+
+class _PersonCounts:
+    __slots__ = ("total", "layers", "rels", "co_occurring")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.layers: dict[str, int] = {}
+        self.rels: dict[str, int] = {}
+        self.co_occurring: dict[str, int] = {}
+
+
+class PersonCardAccumulator:
+    """Collect per-person counts while the assertion indexes are built."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, _PersonCounts] = {}
+
+    def add(self, *, endpoints: Iterable[str], layer: str, rel: str) -> None:
+        """Count one assertion for each distinct person among its endpoints."""
+        person_ids = set(endpoints)
+        for person_id in person_ids:
+            counts = self._counts.get(person_id)
+            if counts is None:
+                counts = self._counts[person_id] = _PersonCounts()
+            counts.total += 1
+            counts.layers[layer] = counts.layers.get(layer, 0) + 1
+            counts.rels[rel] = counts.rels.get(rel, 0) + 1
+            for other in person_ids:
+                if other != person_id:
+                    counts.co_occurring[other] = counts.co_occurring.get(other, 0) + 1
+
+    def build_shards(
+        self, persons_by_id: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return shard key -> person id -> card for persons and assertion endpoints."""
+        shards: dict[str, dict[str, dict[str, Any]]] = {}
+        for person_id in sorted(set(persons_by_id) | set(self._counts)):
+            counts = self._counts.get(person_id) or _PersonCounts()
+            person = persons_by_id.get(person_id)
+            display_name = (
+                resolve_person_display_name(person, person_id)
+                if isinstance(person, dict)
+                else person_id
+            )
+            ranked = sorted(
+                counts.co_occurring.items(), key=lambda item: (-item[1], item[0])
+            )
+            shards.setdefault(card_shard_key(person_id), {})[person_id] = {
+                "display_name": display_name,
+                "assertion_count": counts.total,
+                "layers": sorted(counts.layers),
+                "assertion_count_by_layer": dict(sorted(counts.layers.items())),
+                "rel_count_by_type": dict(sorted(counts.rels.items())),
+                "top_co_occurring": [
+                    {"personId": other, "count": count}
+                    for other, count in ranked[:MAX_CO_OCCURRING_PERSONS]
+                ],
+            }
+        return shards
@@ -0,0 +1,68 @@
+"""Field projection profiles for assertion artifacts."""
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable
+
+PROJECTION_PROFILES = ("full", "lean")
+LEAN_ASSERTION_FIELDS = ("id", "subject", "object", "predicate")
+LEAN_PSELLOS_FIELDS = ("layer", "rel")
+DETAIL_SHARD_PREFIX_LENGTH = 2
+
+
+def detail_shard_key(assertion_id: str) -> str:
+    """Return the shard key (leading sha1 hex digits) for an assertion id."""
+    digest = hashlib.sha1(assertion_id.encode("utf-8")).hexdigest()
+    return digest[:DETAIL_SHARD_PREFIX_LENGTH]
+
+
+def lean_assertion(assertion: dict[str, Any]) -> dict[str, Any]:
+    """Return the lean core of an assertion.
+
+    The core keeps the lean fields plus the psellos ``layer`` and ``rel``
+    under ``extensions.psellos``, so layer helpers read it unchanged.
+    Assertions without a string id cannot be keyed to a detail record and
+    are returned whole.
+    """
+    if not isinstance(assertion.get("id"), str):
+        return assertion
+    core = {
+        field: assertion[field] for field in LEAN_ASSERTION_FIELDS if field in assertion
+    }
+    extensions = assertion.get("extensions")
+    psellos = extensions.get("psellos") if isinstance(extensions, dict) else None
+    if isinstance(psellos, dict):
+        kept = {
+            field: psellos[field] for field in LEAN_PSELLOS_FIELDS if field in psellos
+        }
+        if kept:
+            core["extensions"] = {"psellos": kept}
+    return core
+
+
+def assertion_detail(assertion: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields left out of the lean core.
+
+    ``extensions`` is kept whole, so ``{**core, **detail}`` restores the
+    full assertion.
+    """
+    return {
+        key: value
+        for key, value in assertion.items()
+        if key not in LEAN_ASSERTION_FIELDS
+    }
+
+
+def build_detail_shards(
+    assertions: Iterable[dict[str, Any]],
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Return shard key -> assertion id -> detail for assertions with detail fields."""
+    shards: dict[str, dict[str, dict[str, Any]]] = {}
+    for assertion in assertions:
+        assertion_id = assertion.get("id")
+        if not isinstance(assertion_id, str):
+            continue
+        detail = assertion_detail(assertion)
+        if detail:
+            shards.setdefault(detail_shard_key(assertion_id), {})[assertion_id] = detail
+    return shards
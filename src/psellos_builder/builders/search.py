@@ -0,0 +1,123 @@
+"""Person name search index generation."""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Iterable
+
+from psellos_builder.builders.manifest import resolve_person_display_name
+
+SEARCH_SHARD_KEY_LENGTH = 2
+TRIGRAM_LENGTH = 3
+SEARCH_NORMALIZATION = "casefold+nfd-strip-combining"
+
+_TOKEN_SEPARATOR = re.compile(r"[\W_]+")
+
+
+def normalize_name(value: str) -> str:
+    """Fold a name for matching: casefold, strip diacritics, collapse separators."""
+    decomposed = unicodedata.normalize("NFD", value.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(token for token in _TOKEN_SEPARATOR.split(stripped) if token)
+
+
+def _iter_name_variants(person: dict[str, Any]) -> Iterable[str]:
+    for key in ("name", "label"):
+        value = person.get(key)
+        if isinstance(value, str):
+            yield value
+    names = person.get("names")
+    if not isinstance(names, list):
+        return
+    for entry in names:
+        if isinstance(entry, str):
+            yield entry
+        elif isinstance(entry, dict):
+            for key in ("value", "name"):
+                value = entry.get(key)
+                if isinstance(value, str):
+                    yield value
+
+
+def _person_tokens(person: dict[str, Any]) -> set[str]:
+    tokens: set[str] = set()
+    for variant in _iter_name_variants(person):
+        tokens.update(normalize_name(variant).split())
+    return tokens
+
+
+def _trigrams(token: str) -> set[str]:
+    return {
+        token[start : start + TRIGRAM_LENGTH]
+        for start in range(len(token) - TRIGRAM_LENGTH + 1)
+    }
+
+
+def shard_key(term: str) -> str:
+    """Return the shard key for a normalized token or trigram."""
+    return term[:SEARCH_SHARD_KEY_LENGTH]
+
+
+def shard_filename(key: str) -> str:
+    """Return the ASCII-safe file name for a shard key (hex of its UTF-8 bytes)."""
+    return f"{key.encode('utf-8').hex()}.json"
+
+
+def _add_posting(
+    shards: dict[str, dict[str, set[str]]], term: str, person_id: str
+) -> None:
+    shards.setdefault(shard_key(term), {}).setdefault(term, set()).add(person_id)
+
+
+def _finalize_shards(
+    postings: dict[str, dict[str, set[str]]], display_names: dict[str, str]
+) -> dict[str, dict[str, Any]]:
+    shards: dict[str, dict[str, Any]] = {}
+    for key in sorted(postings):
+        terms = {
+            term: sorted(person_ids)
+            for term, person_ids in sorted(postings[key].items())
+        }
+        person_ids = sorted({pid for ids in terms.values() for pid in ids})
+        shards[key] = {
+            "terms": terms,
+            "names": {pid: display_names[pid] for pid in person_ids},
+        }
+    return shards
+
+
+def build_search_index(persons: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return sharded prefix and trigram indexes over all person name variants."""
+    prefix_postings: dict[str, dict[str, set[str]]] = {}
+    trigram_postings: dict[str, dict[str, set[str]]] = {}
+    display_names: dict[str, str] = {}
+    for person in persons:
+        person_id = person["id"]
+        tokens = _person_tokens(person)
+        if not tokens:
+            continue
+        display_names[person_id] = resolve_person_display_name(person, person_id)
+        for token in tokens:
+            _add_posting(prefix_postings, token, person_id)
+            for trigram in _trigrams(token):
+                _add_posting(trigram_postings, trigram, person_id)
+
+    prefix_shards = _finalize_shards(prefix_postings, display_names)
+    trigram_shards = _finalize_shards(trigram_postings, display_names)
+    directory = {
+        "normalization": SEARCH_NORMALIZATION,
+        "shard_key_length": SEARCH_SHARD_KEY_LENGTH,
+        "trigram_length": TRIGRAM_LENGTH,
+        "person_count": len(display_names),
+        "prefix_shards": {
+            key: f"prefix/{shard_filename(key)}" for key in prefix_shards
+        },
+        "trigram_shards": {
+            key: f"trigram/{shard_filename(key)}" for key in trigram_shards
+        },
+    }
+    return {
+        "directory": directory,
+        "prefix": prefix_shards,
+        "trigram": trigram_shards,
+    }
@@ -2,17 +2,36 @@
 from __future__ import annotations
 
 import argparse
+import importlib
+import sys
 from pathlib import Path
 
-from psellos_builder.builders.compile import compile_dataset
+from psellos_builder.builders.projection import PROJECTION_PROFILES
+
+SUBCOMMANDS = {
+    "serve": "psellos_builder.server",
+    "bundle-schema": "psellos_builder.validators.bundle",
+    "diff": "psellos_builder.diff",
+    "publish": "psellos_builder.exporters.publish",
+}
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="psellos-builder",
         description="Validate and compile prosopographical datasets into static JSON artifacts.",
+        epilog="Other commands: " + ", ".join(
+            f"psellos-builder {name}" for name in SUBCOMMANDS
+        ),
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help=(
+            "Path to a raw dataset JSON/NDJSON file, a directory of shards, a glob, "
+            "or '-' to read NDJSON from stdin."
+        ),
     )
-    parser.add_argument("input", type=Path, help="Path to raw dataset JSON file.")
     parser.add_argument("--spec", type=Path, required=True, help="Path to psellos-spec v0.1.0 schema.")
     parser.add_argument(
         "--dist",
@@ -20,13 +39,107 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("dist"),
         help="Output directory for compiled artifacts.",
     )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="Emit the sharded person name search index under dist/search/.",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        help="Also write assertions as fixed-size pages with a page directory.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=(
+            "Worker processes for loading dataset shards and computing layer "
+            "stats (defaults to CPU count)."
+        ),
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Also write persons.ndjson and assertions.ndjson.",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        help="Also export persons and assertions into an indexed SQLite database.",
+    )
+    parser.add_argument(
+        "--content-addressed",
+        action="store_true",
+        help=(
+            "Also write each artifact as name.<hash>.ext and map logical names "
+            "to hashed names in manifest.json."
+        ),
+    )
+    parser.add_argument(
+        "--person-cards",
+        action="store_true",
+        help="Emit per-person summary cards under dist/person_cards/, sharded by id hash.",
+    )
+    parser.add_argument(
+        "--projection",
+        choices=PROJECTION_PROFILES,
+        default="full",
+        help=(
+            "Assertion fields in assertions.json, assertions_by_id.json, and pages; "
+            "'lean' keeps id, endpoints, predicate, layer, and rel and moves the rest "
+            "to dist/assertion_details/."
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Validate in a separate process while artifacts are built into a staging "
+            "directory, then move them into --dist once validation passes. The "
+            "input is parsed in both processes, so peak memory roughly doubles; "
+            "this only pays off with two or more idle cores."
+        ),
+    )
+    parser.add_argument(
+        "--index-memory-mb",
+        type=int,
+        help=(
+            "Build person indexes from sorted on-disk runs, buffering at most "
+            "roughly this many megabytes of index entries in memory."
+        ),
+    )
     return parser
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        command = importlib.import_module(SUBCOMMANDS[argv[0]])
+        return command.main(argv[1:])
     parser = build_parser()
-    args = parser.parse_args()
-    compile_dataset(spec_path=args.spec, input_path=args.input, dist_path=args.dist)
+    args = parser.parse_args(argv)
+    # Imported lazily so --help and subcommands skip the build pipeline imports.
+    from psellos_builder.builders.compile import compile_dataset
+
+    compile_dataset(
+        spec_path=args.spec,
+        input_path=args.input,
+        dist_path=args.dist,
+        search_index=args.search_index,
+        page_size=args.page_size,
+        workers=args.workers,
+        ndjson=args.ndjson,
+        sqlite_path=args.sqlite,
+        content_addressed=args.content_addressed,
+        person_cards=args.person_cards,
+        projection=args.projection,
+        pipelined=args.pipeline,
+        index_memory_budget=(
+            args.index_memory_mb * 1024 * 1024
+            if args.index_memory_mb is not None
+            else None
+        ),
+    )
     return 0
 
 
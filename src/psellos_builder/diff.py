@@ -0,0 +1,319 @@
+"""Streaming changesets between two compiled dist/ directories."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
+
+from psellos_builder.builders.layer_stats import increment_person_counts, top_persons
+from psellos_builder.builders.projection import assertion_detail, lean_assertion
+from psellos_builder.exporters.artifacts import encode_json
+from psellos_builder.layers import get_layer, get_rel_type
+
+DEFAULT_CHANGESET_PATH = Path("changeset.json")
+READ_CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\n\r"
+_MISSING = object()
+
+
+class _ObjectReader:
+    """Incrementally decode the members of a top-level JSON object."""
+
+    def __init__(self, handle: TextIO, source: Path) -> None:
+        self._handle = handle
+        self._source = source
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(max(READ_CHUNK_SIZE, len(self._buffer)))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in _WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                raise ValueError(f"Unexpected end of JSON in {self._source}")
+
+    def _expect(self, token: str) -> None:
+        if self._peek() != token:
+            raise ValueError(
+                f"Expected {token!r} in {self._source}, found {self._buffer[self._pos]!r}"
+            )
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue past the buffer; confirm its end.
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key in {self._source}")
+            self._expect(":")
+            yield key, self._value()
+            if self._peek() == "}":
+                return
+            self._expect(",")
+
+
+def iter_object_items(path: Path) -> Iterator[tuple[str, Any]]:
+    """Yield the members of a JSON object file without loading it whole."""
+    with path.open("r", encoding="utf-8") as handle:
+        yield from _ObjectReader(handle, path).items()
+
+
+def record_digest(record: Any) -> str:
+    """Return the sha256 of a record's canonical (sorted, compact) JSON form."""
+    encoded = json.dumps(
+        record, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _sorted_items(path: Path) -> Iterator[tuple[str, Any]]:
+    previous: str | None = None
+    for key, value in iter_object_items(path):
+        if previous is not None and key <= previous:
+            raise ValueError(f"{path} keys must be sorted and unique: {key!r}")
+        previous = key
+        yield key, value
+
+
+def _merge_join(
+    old_items: Iterator[tuple[str, Any]], new_items: Iterator[tuple[str, Any]]
+) -> Iterator[tuple[str, Any, Any]]:
+    old = next(old_items, _MISSING)
+    new = next(new_items, _MISSING)
+    while old is not _MISSING or new is not _MISSING:
+        if new is _MISSING or (old is not _MISSING and old[0] < new[0]):
+            yield old[0], old[1], _MISSING
+            old = next(old_items, _MISSING)
+        elif old is _MISSING or new[0] < old[0]:
+            yield new[0], _MISSING, new[1]
+            new = next(new_items, _MISSING)
+        else:
+            yield old[0], old[1], new[1]
+            old = next(old_items, _MISSING)
+            new = next(new_items, _MISSING)
+
+
+def _diff_records(
+    old_path: Path,
+    new_path: Path,
+    *,
+    old_digest: Callable[[str, Any], Any] | None = None,
+    new_digest: Callable[[str, Any], Any] | None = None,
+) -> Iterator[tuple[str, str, Any, Any]]:
+    for key, old, new in _merge_join(_sorted_items(old_path), _sorted_items(new_path)):
+        if old is _MISSING:
+            yield "added", key, None, new
+        elif new is _MISSING:
+            yield "removed", key, old, None
+        elif old_digest is None or new_digest is None:
+            if record_digest(old) != record_digest(new):
+                yield "changed", key, old, new
+        elif old_digest(key, old) != new_digest(key, new):
+            yield "changed", key, old, new
+
+
+def _load_detail_digests(dist_path: Path) -> dict[str, str] | None:
+    """Return assertion id -> detail digest for a lean dist, ``None`` otherwise."""
+    manifest_path = dist_path / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if not isinstance(manifest, dict) or manifest.get("projection") != "lean":
+        return None
+    directory_path = _require(dist_path, "assertion_details/index.json")
+    with directory_path.open("r", encoding="utf-8") as handle:
+        directory = json.load(handle)
+    digests: dict[str, str] = {}
+    for key in directory["shards"]:
+        shard_path = _require(dist_path, f"assertion_details/{key}.json")
+        for assertion_id, detail in iter_object_items(shard_path):
+            digests[assertion_id] = record_digest(detail)
+    return digests
+
+
+def _split_digest(
+    detail_digests: dict[str, str] | None,
+) -> Callable[[str, Any], tuple[str, str | None]]:
+    # Lean records are compared as (core digest, detail digest); full records
+    # are split the same way so lean and full builds compare with each other.
+    def digest(assertion_id: str, record: Any) -> tuple[str, str | None]:
+        if not isinstance(record, dict):
+            return record_digest(record), None
+        if detail_digests is not None:
+            return record_digest(record), detail_digests.get(assertion_id)
+        detail = assertion_detail(record)
+        core_digest = record_digest(lean_assertion(record))
+        return core_digest, record_digest(detail) if detail else None
+
+    return digest
+
+
+class _LayerChanges:
+    def __init__(self) -> None:
+        self.added_count = 0
+        self.removed_count = 0
+        self.changed_count = 0
+        self.added_persons: dict[str, int] = {}
+        self.removed_persons: dict[str, int] = {}
+        self.added_rels: dict[str, int] = {}
+        self.removed_rels: dict[str, int] = {}
+
+    def add(self, assertion: dict[str, Any]) -> None:
+        self.added_count += 1
+        increment_person_counts(self.added_persons, assertion)
+        rel_type = get_rel_type(assertion)
+        self.added_rels[rel_type] = self.added_rels.get(rel_type, 0) + 1
+
+    def remove(self, assertion: dict[str, Any]) -> None:
+        self.removed_count += 1
+        increment_person_counts(self.removed_persons, assertion)
+        rel_type = get_rel_type(assertion)
+        self.removed_rels[rel_type] = self.removed_rels.get(rel_type, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "added_count": self.added_count,
+            "removed_count": self.removed_count,
+            "changed_count": self.changed_count,
+            "added_persons_topN": top_persons(self.added_persons),
+            "removed_persons_topN": top_persons(self.removed_persons),
+            "added_rel_count_by_type": dict(sorted(self.added_rels.items())),
+            "removed_rel_count_by_type": dict(sorted(self.removed_rels.items())),
+        }
+
+
+def _load_layers(dist_path: Path) -> list[str]:
+    path = dist_path / "layers.json"
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _require(dist_path: Path, name: str) -> Path:
+    path = dist_path / name
+    if not path.exists():
+        raise FileNotFoundError(f"{name} was not found in {dist_path}.")
+    return path
+
+
+def diff_dists(*, old_dist: Path, new_dist: Path) -> dict[str, Any]:
+    """Compare persons and assertions between two builds by record digest.
+
+    Both ``persons.json`` and ``assertions_by_id.json`` are read as streams
+    and merge-joined on their sorted keys, so memory use is bounded by the
+    size of the changeset. Per-layer summaries follow the ``compare_to_canon``
+    format of ``layer_stats.json``; an assertion that moves between layers
+    counts as removed from the old layer and added to the new one. For builds
+    with the lean projection, each record's ``assertion_details/`` fields are
+    folded into the comparison via per-id digests, which are held in memory.
+    """
+    persons: dict[str, list[str]] = {"added": [], "removed": [], "changed": []}
+    for change, person_id, _, _ in _diff_records(
+        _require(old_dist, "persons.json"), _require(new_dist, "persons.json")
+    ):
+        persons[change].append(person_id)
+
+    assertions: dict[str, list[str]] = {"added": [], "removed": [], "changed": []}
+    layers: dict[str, _LayerChanges] = {
+        layer: _LayerChanges()
+        for layer in sorted({*_load_layers(old_dist), *_load_layers(new_dist)})
+    }
+    old_details = _load_detail_digests(old_dist)
+    new_details = _load_detail_digests(new_dist)
+    split = old_details is not None or new_details is not None
+    for change, assertion_id, old, new in _diff_records(
+        _require(old_dist, "assertions_by_id.json"),
+        _require(new_dist, "assertions_by_id.json"),
+        old_digest=_split_digest(old_details) if split else None,
+        new_digest=_split_digest(new_details) if split else None,
+    ):
+        assertions[change].append(assertion_id)
+        old_layer = get_layer(old) if isinstance(old, dict) else None
+        new_layer = get_layer(new) if isinstance(new, dict) else None
+        if old_layer is not None and old_layer == new_layer:
+            layers.setdefault(old_layer, _LayerChanges()).changed_count += 1
+            continue
+        if old_layer is not None:
+            layers.setdefault(old_layer, _LayerChanges()).remove(old)
+        if new_layer is not None:
+            layers.setdefault(new_layer, _LayerChanges()).add(new)
+
+    return {
+        "summary": {
+            "persons": {change: len(ids) for change, ids in persons.items()},
+            "assertions": {change: len(ids) for change, ids in assertions.items()},
+        },
+        "persons": persons,
+        "assertions": assertions,
+        "layers": {layer: layers[layer].summary() for layer in sorted(layers)},
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="psellos-builder diff",
+        description="Report persons and assertions added, removed, or changed between builds.",
+    )
+    parser.add_argument("old_dist", type=Path, help="Previous dist/ directory.")
+    parser.add_argument("new_dist", type=Path, help="New dist/ directory.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_CHANGESET_PATH,
+        help="Path for the changeset JSON artifact.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    changeset = diff_dists(old_dist=args.old_dist, new_dist=args.new_dist)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_bytes(encode_json(changeset))
+    for kind, counts in changeset["summary"].items():
+        print(
+            f"{kind}: {counts['added']} added, {counts['removed']} removed, "
+            f"{counts['changed']} changed"
+        )
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
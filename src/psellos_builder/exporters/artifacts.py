@@ -0,0 +1,185 @@
+"""Artifact file writing with per-file content digests."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Any, Iterator
+
+CONTENT_HASH_LENGTH = 16
+WRITER_THREADS = 2
+WRITE_QUEUE_SIZE = 16
+
+
+def _copy_atomic(source: Path, target: Path) -> None:
+    # A hashed name promises fixed contents, so an interrupted copy must never
+    # leave a partial file under it.
+    handle, temp_name = tempfile.mkstemp(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+    )
+    os.close(handle)
+    try:
+        shutil.copyfile(source, temp_name)
+        shutil.copymode(source, temp_name)
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def encode_json(payload: Any, *, sort_keys: bool = True) -> bytes:
+    """Encode a payload exactly as dist artifacts are written (indented, newline)."""
+    return (json.dumps(payload, sort_keys=sort_keys, indent=2) + "\n").encode("utf-8")
+
+
+def content_addressed_name(relative: str, digest: str) -> str:
+    """Return ``dir/name.<hash>.ext`` for a logical artifact path."""
+    path = PurePosixPath(relative)
+    return str(
+        path.with_name(f"{path.stem}.{digest[:CONTENT_HASH_LENGTH]}{path.suffix}")
+    )
+
+
+class _HashingTextWriter:
+    def __init__(self, handle: Any, digest: Any) -> None:
+        self._handle = handle
+        self._digest = digest
+
+    def write(self, text: str) -> int:
+        encoded = text.encode("utf-8")
+        self._digest.update(encoded)
+        self._handle.write(encoded)
+        return len(text)
+
+
+class ArtifactWriter:
+    """Write artifacts under a dist root and record their sha256 digests."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.digests: dict[str, str] = {}
+
+    def path_for(self, relative: str) -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def write_bytes(self, relative: str, data: bytes) -> int:
+        self.path_for(relative).write_bytes(data)
+        self.digests[relative] = hashlib.sha256(data).hexdigest()
+        return len(data)
+
+    def write_json(self, relative: str, payload: Any, *, sort_keys: bool = True) -> int:
+        return self.write_bytes(relative, encode_json(payload, sort_keys=sort_keys))
+
+    @contextmanager
+    def open_text(self, relative: str) -> Iterator[_HashingTextWriter]:
+        """Open an artifact for incremental text writes, hashing as it streams."""
+        digest = hashlib.sha256()
+        with self.path_for(relative).open("wb") as handle:
+            yield _HashingTextWriter(handle, digest)
+        self.digests[relative] = digest.hexdigest()
+
+    def write_content_addressed(self, *, exclude: frozenset[str]) -> dict[str, str]:
+        """Copy each recorded artifact to ``name.<hash>.ext``; return logical -> hashed.
+
+        The mapping becomes the manifest's ``artifacts`` map. Existing hashed
+        files are kept, since their name fixes their contents.
+        """
+        artifacts: dict[str, str] = {}
+        for relative in sorted(self.digests):
+            if relative in exclude:
+                continue
+            hashed = content_addressed_name(relative, self.digests[relative])
+            target = self.root / hashed
+            if not target.exists():
+                _copy_atomic(self.root / relative, target)
+            artifacts[relative] = hashed
+        return artifacts
+
+
+class BackgroundArtifactWriter(ArtifactWriter):
+    """ArtifactWriter that hashes and writes payloads on background threads.
+
+    Payloads are still encoded by the caller, since JSON encoding holds the
+    GIL, but sha256 and file writes release it, so disk output overlaps with
+    index and stats building. The queue is bounded: producers block when the
+    writers fall behind. The first write error is re-raised by the next write,
+    ``flush``, or ``close``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        threads: int = WRITER_THREADS,
+        queue_size: int = WRITE_QUEUE_SIZE,
+    ) -> None:
+        super().__init__(root)
+        self._queue: queue.Queue[tuple[str, bytes] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._cancelled = False
+        self._threads = [
+            threading.Thread(target=self._drain, daemon=True) for _ in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None and not self._cancelled:
+                    ArtifactWriter.write_bytes(self, *item)
+            except BaseException as exc:
+                with self._lock:
+                    if self._error is None:
+                        self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write_bytes(self, relative: str, data: bytes) -> int:
+        self._raise_error()
+        self._queue.put((relative, data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Wait until every queued artifact is on disk."""
+        self._queue.join()
+        self._raise_error()
+
+    def write_content_addressed(self, *, exclude: frozenset[str]) -> dict[str, str]:
+        self.flush()
+        return super().write_content_addressed(exclude=exclude)
+
+    def _stop(self) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def close(self) -> None:
+        """Finish queued writes, stop the threads, and re-raise any write error."""
+        self._stop()
+        self._raise_error()
+
+    def abort(self) -> None:
+        """Drop queued writes and stop the threads without raising."""
+        self._cancelled = True
+        self._stop()
@@ -2,32 +2,50 @@
 from __future__ import annotations
 
 import json
+import re
 import warnings
 from pathlib import Path
 from typing import Any
 
-from psellos_builder.layers import build_layer_indexes
-
-LAYER_META_SOURCE_NAME = "layers_meta.source.json"
-MAX_TOP_PERSONS = 20
-MISSING_REL_TYPE = "(none)"
-
-
-def _normalize_endpoint(value: Any) -> str:
-    if isinstance(value, str):
-        return value
-    if isinstance(value, dict) and "id" in value:
-        return str(value["id"])
-    raise ValueError(f"Unexpected assertion endpoint shape: {value!r}")
-
-
-def _normalize_assertion(assertion: dict[str, Any]) -> dict[str, Any]:
-    normalized = dict(assertion)
-    if "subject" in normalized:
-        normalized["subject"] = _normalize_endpoint(normalized["subject"])
-    if "object" in normalized:
-        normalized["object"] = _normalize_endpoint(normalized["object"])
-    return normalized
+from psellos_builder.builders.external_index import (
+    ExternalPersonIndex,
+    write_person_indexes,
+)
+from psellos_builder.builders.integrity import IntegrityChecker
+from psellos_builder.builders.layer_stats import (
+    build_layer_stats,
+    count_persons_by_layer,
+)
+from psellos_builder.builders.person_cards import (
+    CARD_SHARD_PREFIX_LENGTH,
+    PersonCardAccumulator,
+)
+from psellos_builder.builders.projection import (
+    DETAIL_SHARD_PREFIX_LENGTH,
+    PROJECTION_PROFILES,
+    build_detail_shards,
+    lean_assertion,
+)
+from psellos_builder.builders.search import build_search_index, shard_filename
+from psellos_builder.exporters.artifacts import ArtifactWriter, encode_json
+from psellos_builder.exporters.ndjson_writer import write_ndjson_records
+from psellos_builder.layers import (
+    build_assertions_by_layer,
+    build_layer_indexes,
+    get_layer,
+    get_rel_type,
+    normalize_assertion,
+)
+from psellos_builder.loaders import LAYER_META_SOURCE_NAME, dataset_root
+
+MANIFEST_NAME = "manifest.json"
+SEARCH_DIR_NAME = "search"
+ASSERTIONS_PAGE_DIR_NAME = "assertions"
+ASSERTIONS_BY_LAYER_PAGE_DIR_NAME = "assertions_by_layer"
+PAGE_DIRECTORY_NAME = "index.json"
+PERSON_CARDS_DIR_NAME = "person_cards"
+ASSERTION_DETAILS_DIR_NAME = "assertion_details"
+INTEGRITY_REPORT_NAME = "integrity_report.json"
 
 
 def _add_to_index(
@@ -36,8 +54,19 @@ def _add_to_index(
     index.setdefault(person_id, set()).add(assertion_id)
 
 
+def _add_to_person_cards(
+    cards: PersonCardAccumulator, assertion: dict[str, Any], layer: str
+) -> None:
+    endpoints = [
+        assertion[role] for role in ("subject", "object") if role in assertion
+    ]
+    cards.add(endpoints=endpoints, layer=layer, rel=get_rel_type(assertion))
+
+
 def _build_assertion_indexes(
-    assertions: list[dict[str, Any]]
+    assertions: list[dict[str, Any]],
+    cards: PersonCardAccumulator | None = None,
+    integrity: IntegrityChecker | None = None,
 ) -> tuple[dict[str, list[str]], dict[str, dict[str, Any]]]:
     assertions_by_person: dict[str, set[str]] = {}
     assertions_by_id: dict[str, dict[str, Any]] = {}
@@ -45,6 +74,19 @@ def _build_assertion_indexes(
         assertion_id = assertion.get("id")
         if not isinstance(assertion_id, str):
             continue
+        duplicate = assertion_id in assertions_by_id
+        if cards is not None or integrity is not None:
+            layer = get_layer(assertion)
+            # Cards count each assertion id once, like the id sets below.
+            if cards is not None and not duplicate:
+                _add_to_person_cards(cards, assertion, layer)
+            if integrity is not None:
+                integrity.add(
+                    assertion,
+                    assertion_id=assertion_id,
+                    layer=layer,
+                    duplicate=duplicate,
+                )
         assertions_by_id[assertion_id] = assertion
         if "subject" in assertion:
             _add_to_index(assertions_by_person, assertion["subject"], assertion_id)
@@ -57,6 +99,52 @@ def _build_assertion_indexes(
     return sorted_by_person, assertions_by_id
 
 
+def _write_external_person_indexes(
+    *,
+    writer: ArtifactWriter,
+    assertions: list[dict[str, Any]],
+    memory_budget: int,
+    cards: PersonCardAccumulator | None = None,
+    integrity: IntegrityChecker | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, int]]:
+    """Build the person indexes from sorted on-disk runs instead of in memory.
+
+    The output is identical to the in-memory build; ``memory_budget`` is in bytes.
+    """
+    assertions_by_id: dict[str, dict[str, Any]] = {}
+    with ExternalPersonIndex(memory_budget=memory_budget) as person_index:
+        for assertion in assertions:
+            assertion_id = assertion.get("id")
+            if not isinstance(assertion_id, str):
+                continue
+            layer = get_layer(assertion)
+            duplicate = assertion_id in assertions_by_id
+            if cards is not None and not duplicate:
+                _add_to_person_cards(cards, assertion, layer)
+            if integrity is not None:
+                integrity.add(
+                    assertion,
+                    assertion_id=assertion_id,
+                    layer=layer,
+                    duplicate=duplicate,
+                )
+            assertions_by_id[assertion_id] = assertion
+            if "subject" in assertion:
+                person_index.add(assertion["subject"], layer, assertion_id)
+            if "object" in assertion:
+                person_index.add(assertion["object"], layer, assertion_id)
+        with writer.open_text("assertions_by_person.json") as by_person:
+            with writer.open_text(
+                "assertions_by_person_by_layer.json"
+            ) as by_person_by_layer:
+                person_counts_by_layer = write_person_indexes(
+                    person_index.iter_sorted(),
+                    by_person_handle=by_person,
+                    by_person_by_layer_handle=by_person_by_layer,
+                )
+    return assertions_by_id, person_counts_by_layer
+
+
 def _load_layers_meta_source(path: Path) -> dict[str, Any]:
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
@@ -103,7 +191,7 @@ def _load_layers_meta(
 ) -> dict[str, Any] | None:
     if input_path is None:
         return None
-    source_path = input_path.parent / LAYER_META_SOURCE_NAME
+    source_path = dataset_root(input_path) / LAYER_META_SOURCE_NAME
     if not source_path.exists():
         return None
     raw = _load_layers_meta_source(source_path)
@@ -114,123 +202,175 @@ def _load_layers_meta(
     )
 
 
-def _extract_rel_type(assertion: dict[str, Any]) -> str:
-    extensions = assertion.get("extensions")
-    if isinstance(extensions, dict):
-        psellos = extensions.get("psellos")
-        if isinstance(psellos, dict):
-            rel_type = psellos.get("rel")
-            if isinstance(rel_type, str) and rel_type:
-                return rel_type
-    return MISSING_REL_TYPE
+def _write_integrity_report(writer: ArtifactWriter, report: dict[str, Any]) -> None:
+    writer.write_json(INTEGRITY_REPORT_NAME, report)
+    issues = [
+        f"{report[check]['count']} {check.replace('_', ' ')}"
+        for check in ("duplicate_assertion_ids", "dangling_endpoints", "unknown_layers")
+        if report[check]["count"]
+    ]
+    if issues:
+        warnings.warn(
+            f"Integrity issues ({', '.join(issues)}); see {INTEGRITY_REPORT_NAME}.",
+            stacklevel=3,
+        )
 
 
-def _increment_rel_counts(
-    counts: dict[str, int], assertion: dict[str, Any]
+def _write_search_index(
+    writer: ArtifactWriter, persons: list[dict[str, Any]]
 ) -> None:
-    rel_type = _extract_rel_type(assertion)
-    counts[rel_type] = counts.get(rel_type, 0) + 1
+    search_index = build_search_index(persons)
+    for section in ("prefix", "trigram"):
+        for key, shard in search_index[section].items():
+            writer.write_json(
+                f"{SEARCH_DIR_NAME}/{section}/{shard_filename(key)}", shard
+            )
+    writer.write_json(f"{SEARCH_DIR_NAME}/index.json", search_index["directory"])
 
 
-def _increment_person_counts(
-    counts: dict[str, int], assertion: dict[str, Any]
+def _write_person_cards(
+    writer: ArtifactWriter,
+    cards: PersonCardAccumulator,
+    persons_by_id: dict[str, dict[str, Any]],
 ) -> None:
-    subject = assertion.get("subject")
-    if isinstance(subject, str):
-        counts[subject] = counts.get(subject, 0) + 1
-    obj = assertion.get("object")
-    if isinstance(obj, str):
-        counts[obj] = counts.get(obj, 0) + 1
-
-
-def _top_persons(counts: dict[str, int]) -> list[dict[str, Any]]:
-    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
-    return [
-        {"personId": person_id, "count": count}
-        for person_id, count in ranked[:MAX_TOP_PERSONS]
-    ]
+    """Write a summary card per person under ``person_cards/``, sharded by sha1."""
+    shards = cards.build_shards(persons_by_id)
+    for key, shard in shards.items():
+        writer.write_json(f"{PERSON_CARDS_DIR_NAME}/{key}.json", shard)
+    writer.write_json(
+        f"{PERSON_CARDS_DIR_NAME}/index.json",
+        {
+            "hash": "sha1",
+            "prefix_length": CARD_SHARD_PREFIX_LENGTH,
+            "shards": sorted(shards),
+        },
+    )
+
+
+def _write_assertion_details(
+    writer: ArtifactWriter, assertions_by_id: dict[str, dict[str, Any]]
+) -> None:
+    shards = build_detail_shards(assertions_by_id.values())
+    for key, shard in shards.items():
+        writer.write_json(f"{ASSERTION_DETAILS_DIR_NAME}/{key}.json", shard)
+    writer.write_json(
+        f"{ASSERTION_DETAILS_DIR_NAME}/index.json",
+        {
+            "hash": "sha1",
+            "prefix_length": DETAIL_SHARD_PREFIX_LENGTH,
+            "shards": sorted(shards),
+        },
+    )
+
+
+def _write_projection(
+    writer: ArtifactWriter, assertions_by_id: dict[str, dict[str, Any]], *, lean: bool
+) -> dict[str, dict[str, Any]]:
+    """Write ``assertions_by_id.json`` in the projection; return what was written.
+
+    The lean projection keeps only each assertion's core fields and moves the
+    rest to ``assertion_details/`` shards keyed by id.
+    """
+    if not lean:
+        writer.write_json("assertions_by_id.json", assertions_by_id)
+        return assertions_by_id
+    projected_by_id = {
+        assertion_id: lean_assertion(assertion)
+        for assertion_id, assertion in assertions_by_id.items()
+    }
+    writer.write_json("assertions_by_id.json", projected_by_id)
+    _write_assertion_details(writer, assertions_by_id)
+    return projected_by_id
+
 
+def _page_filename(page_number: int) -> str:
+    return f"page-{page_number:04d}.json"
 
-def _build_layer_stats(
+
+_SAFE_PATH_SEGMENT = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def _layer_path_segment(layer: str) -> str:
+    # Safe ids starting with "x-" are escaped too, so they cannot collide with
+    # the escaped form of another id.
+    if _SAFE_PATH_SEGMENT.fullmatch(layer) and not layer.startswith("x-"):
+        return layer
+    return "x-" + layer.encode("utf-8").hex()
+
+
+def _assertion_sort_key(assertion: dict[str, Any]) -> str:
+    assertion_id = assertion.get("id")
+    return assertion_id if isinstance(assertion_id, str) else ""
+
+
+def _write_assertion_pages(
     *,
-    assertions_by_layer: dict[str, list[str]],
-    assertions_by_person_by_layer: dict[str, dict[str, list[str]]],
-    assertions_by_id: dict[str, dict[str, Any]],
+    writer: ArtifactWriter,
+    relative_dir: str,
+    assertions: list[dict[str, Any]],
+    page_size: int,
 ) -> dict[str, Any]:
-    layer_ids = sorted(assertions_by_layer.keys())
-    assertion_count_by_layer = {
-        layer: len(assertions_by_layer[layer]) for layer in layer_ids
-    }
-    person_count_by_layer: dict[str, int] = {
-        layer: 0 for layer in layer_ids
-    }
-    persons_by_layer: dict[str, set[str]] = {
-        layer: set() for layer in layer_ids
-    }
-    for person_id, layers in assertions_by_person_by_layer.items():
-        for layer in layers:
-            if layer in persons_by_layer:
-                persons_by_layer[layer].add(person_id)
-    for layer in layer_ids:
-        person_count_by_layer[layer] = len(persons_by_layer[layer])
-
-    rel_count_by_layer: dict[str, dict[str, int]] = {
-        layer: {} for layer in layer_ids
-    }
-    top_persons_by_layer: dict[str, list[dict[str, Any]]] = {}
-    for layer in layer_ids:
-        person_counts: dict[str, int] = {}
-        for assertion_id in assertions_by_layer[layer]:
-            assertion = assertions_by_id.get(assertion_id)
-            if not assertion:
-                continue
-            _increment_rel_counts(rel_count_by_layer[layer], assertion)
-            _increment_person_counts(person_counts, assertion)
-        top_persons_by_layer[layer] = _top_persons(person_counts)
-        rel_count_by_layer[layer] = dict(
-            sorted(rel_count_by_layer[layer].items())
+    pages: list[dict[str, Any]] = []
+    for offset in range(0, len(assertions), page_size):
+        chunk = assertions[offset : offset + page_size]
+        relative = f"{relative_dir}/{_page_filename(len(pages) + 1)}"
+        size = writer.write_bytes(relative, encode_json(chunk))
+        pages.append(
+            {
+                "page": len(pages) + 1,
+                "path": relative,
+                "first_id": _assertion_sort_key(chunk[0]),
+                "last_id": _assertion_sort_key(chunk[-1]),
+                "count": len(chunk),
+                "bytes": size,
+            }
         )
+    directory = {
+        "page_size": page_size,
+        "total_count": len(assertions),
+        "page_count": len(pages),
+        "pages": pages,
+    }
+    writer.write_json(f"{relative_dir}/{PAGE_DIRECTORY_NAME}", directory)
+    return directory
 
-    compare_to_canon: dict[str, dict[str, Any]] = {}
-    canon_set = set(assertions_by_layer.get("canon", []))
-    for layer in layer_ids:
-        if layer == "canon":
-            continue
-        layer_set = set(assertions_by_layer[layer])
-        added = sorted(layer_set - canon_set)
-        removed = sorted(canon_set - layer_set)
-        added_person_counts: dict[str, int] = {}
-        removed_person_counts: dict[str, int] = {}
-        added_rel_counts: dict[str, int] = {}
-        removed_rel_counts: dict[str, int] = {}
-        for assertion_id in added:
-            assertion = assertions_by_id.get(assertion_id)
-            if not assertion:
-                continue
-            _increment_person_counts(added_person_counts, assertion)
-            _increment_rel_counts(added_rel_counts, assertion)
-        for assertion_id in removed:
-            assertion = assertions_by_id.get(assertion_id)
-            if not assertion:
-                continue
-            _increment_person_counts(removed_person_counts, assertion)
-            _increment_rel_counts(removed_rel_counts, assertion)
-        compare_to_canon[layer] = {
-            "added_count": len(added),
-            "removed_count": len(removed),
-            "added_persons_topN": _top_persons(added_person_counts),
-            "removed_persons_topN": _top_persons(removed_person_counts),
-            "added_rel_count_by_type": dict(sorted(added_rel_counts.items())),
-            "removed_rel_count_by_type": dict(sorted(removed_rel_counts.items())),
-        }
 
-    return {
-        "assertion_count_by_layer": assertion_count_by_layer,
-        "person_count_by_layer": person_count_by_layer,
-        "rel_count_by_layer": rel_count_by_layer,
-        "top_persons_by_layer": top_persons_by_layer,
-        "compare_to_canon": compare_to_canon,
-    }
+def _write_paginated_assertions(
+    *,
+    writer: ArtifactWriter,
+    normalized_assertions: list[dict[str, Any]],
+    assertions_by_layer: dict[str, list[str]],
+    assertions_by_id: dict[str, dict[str, Any]],
+    page_size: int,
+) -> None:
+    if page_size < 1:
+        raise ValueError(f"Page size must be a positive integer: {page_size}")
+    _write_assertion_pages(
+        writer=writer,
+        relative_dir=ASSERTIONS_PAGE_DIR_NAME,
+        assertions=sorted(normalized_assertions, key=_assertion_sort_key),
+        page_size=page_size,
+    )
+    layer_directories: dict[str, Any] = {}
+    for layer, assertion_ids in assertions_by_layer.items():
+        relative_dir = (
+            f"{ASSERTIONS_BY_LAYER_PAGE_DIR_NAME}/{_layer_path_segment(layer)}"
+        )
+        directory = _write_assertion_pages(
+            writer=writer,
+            relative_dir=relative_dir,
+            assertions=[assertions_by_id[assertion_id] for assertion_id in assertion_ids],
+            page_size=page_size,
+        )
+        layer_directories[layer] = {
+            "directory": f"{relative_dir}/{PAGE_DIRECTORY_NAME}",
+            "page_count": directory["page_count"],
+            "total_count": directory["total_count"],
+        }
+    writer.write_json(
+        f"{ASSERTIONS_BY_LAYER_PAGE_DIR_NAME}/{PAGE_DIRECTORY_NAME}",
+        {"page_size": page_size, "layers": layer_directories},
+    )
 
 
 def write_dist(
@@ -239,85 +379,126 @@ def write_dist(
     manifest: dict[str, Any],
     dataset: dict[str, Any],
     input_path: Path | None = None,
+    search_index: bool = False,
+    page_size: int | None = None,
+    ndjson: bool = False,
+    content_addressed: bool = False,
+    index_memory_budget: int | None = None,
+    person_cards: bool = False,
+    workers: int | None = None,
+    projection: str = "full",
+    writer: ArtifactWriter | None = None,
 ) -> None:
-    """Serialize compiled artifacts as static JSON."""
+    """Serialize compiled artifacts as static JSON, writing ``manifest.json`` last."""
+    if projection not in PROJECTION_PROFILES:
+        raise ValueError(
+            f"Unknown projection {projection!r}; expected one of {PROJECTION_PROFILES}."
+        )
+    lean = projection == "lean"
     dist_path.mkdir(parents=True, exist_ok=True)
-    manifest_path = dist_path / "manifest.json"
-    with manifest_path.open("w", encoding="utf-8") as handle:
-        json.dump(manifest, handle, sort_keys=True, indent=2)
-        handle.write("\n")
+    # A writer passed in (such as a background writer) is closed by the caller.
+    if writer is None:
+        writer = ArtifactWriter(dist_path)
 
-    persons_path = dist_path / "persons.json"
+    persons = sorted(dataset.get("persons", []), key=lambda entry: entry["id"])
     persons_by_id: dict[str, Any] = {}
-    for person in sorted(dataset.get("persons", []), key=lambda entry: entry["id"]):
+    for person in persons:
         person_id = person["id"]
         if person_id in persons_by_id:
             raise ValueError(f"Duplicate person id detected: {person_id}")
         persons_by_id[person_id] = person
-    with persons_path.open("w", encoding="utf-8") as handle:
-        json.dump(persons_by_id, handle, sort_keys=True, indent=2)
-        handle.write("\n")
-
-    assertions_path = dist_path / "assertions.json"
-    with assertions_path.open("w", encoding="utf-8") as handle:
-        assertions = dataset.get("assertions", [])
-        normalized_assertions = [
-            _normalize_assertion(assertion) for assertion in assertions
-        ]
-        json.dump(normalized_assertions, handle, sort_keys=True, indent=2)
-        handle.write("\n")
-
-    assertions_by_person, assertions_by_id = _build_assertion_indexes(
-        normalized_assertions
-    )
-    assertions_by_layer, assertions_by_person_by_layer = build_layer_indexes(
-        normalized_assertions
-    )
-
-    assertions_by_person_path = dist_path / "assertions_by_person.json"
-    with assertions_by_person_path.open("w", encoding="utf-8") as handle:
-        json.dump(assertions_by_person, handle, sort_keys=True, indent=2)
-        handle.write("\n")
+    writer.write_json("persons.json", persons_by_id)
 
-    assertions_by_id_path = dist_path / "assertions_by_id.json"
-    with assertions_by_id_path.open("w", encoding="utf-8") as handle:
-        json.dump(assertions_by_id, handle, sort_keys=True, indent=2)
-        handle.write("\n")
-
-    assertions_by_layer_path = dist_path / "assertions_by_layer.json"
-    with assertions_by_layer_path.open("w", encoding="utf-8") as handle:
-        json.dump(assertions_by_layer, handle, sort_keys=True, indent=2)
-        handle.write("\n")
+    assertions = dataset.get("assertions", [])
+    normalized_assertions = [
+        normalize_assertion(assertion) for assertion in assertions
+    ]
+    if lean:
+        writer.write_json(
+            "assertions.json",
+            [lean_assertion(assertion) for assertion in normalized_assertions],
+        )
+    else:
+        writer.write_json("assertions.json", normalized_assertions)
+    if ndjson:
+        with writer.open_text("persons.ndjson") as handle:
+            write_ndjson_records(handle, persons_by_id.values())
+        with writer.open_text("assertions.ndjson") as handle:
+            write_ndjson_records(handle, normalized_assertions)
+
+    cards = PersonCardAccumulator() if person_cards else None
+    integrity = IntegrityChecker(
+        persons_by_id,
+        duplicate_sources=getattr(dataset, "duplicate_assertion_sources", None),
+    )
+    if index_memory_budget is None:
+        assertions_by_person, assertions_by_id = _build_assertion_indexes(
+            normalized_assertions, cards, integrity
+        )
+        assertions_by_layer, assertions_by_person_by_layer = build_layer_indexes(
+            normalized_assertions
+        )
+        writer.write_json("assertions_by_person.json", assertions_by_person)
+        writer.write_json(
+            "assertions_by_person_by_layer.json", assertions_by_person_by_layer
+        )
+        person_counts_by_layer = count_persons_by_layer(assertions_by_person_by_layer)
+    else:
+        assertions_by_id, person_counts_by_layer = _write_external_person_indexes(
+            writer=writer,
+            assertions=normalized_assertions,
+            memory_budget=index_memory_budget,
+            cards=cards,
+            integrity=integrity,
+        )
+        assertions_by_layer = build_assertions_by_layer(normalized_assertions)
 
-    layers_path = dist_path / "layers.json"
-    with layers_path.open("w", encoding="utf-8") as handle:
-        json.dump(sorted(assertions_by_layer.keys()), handle, indent=2)
-        handle.write("\n")
+    projected_by_id = _write_projection(writer, assertions_by_id, lean=lean)
+    writer.write_json("assertions_by_layer.json", assertions_by_layer)
+    writer.write_json(
+        "layers.json", sorted(assertions_by_layer.keys()), sort_keys=False
+    )
 
     layers_meta = _load_layers_meta(
         input_path=input_path, observed_layers=sorted(assertions_by_layer.keys())
     )
     if layers_meta is not None:
-        layers_meta_path = dist_path / "layers_meta.json"
-        with layers_meta_path.open("w", encoding="utf-8") as handle:
-            json.dump(layers_meta, handle, sort_keys=True, indent=2)
-            handle.write("\n")
+        writer.write_json("layers_meta.json", layers_meta)
+    _write_integrity_report(writer, integrity.report(layers_meta))
 
-    layer_stats = _build_layer_stats(
+    layer_stats = build_layer_stats(
         assertions_by_layer=assertions_by_layer,
-        assertions_by_person_by_layer=assertions_by_person_by_layer,
+        person_counts_by_layer=person_counts_by_layer,
         assertions_by_id=assertions_by_id,
+        workers=workers,
     )
-    layer_stats_path = dist_path / "layer_stats.json"
-    with layer_stats_path.open("w", encoding="utf-8") as handle:
-        json.dump(layer_stats, handle, sort_keys=True, indent=2)
-        handle.write("\n")
+    writer.write_json("layer_stats.json", layer_stats)
+
+    if page_size is not None:
+        _write_paginated_assertions(
+            writer=writer,
+            normalized_assertions=(
+                [lean_assertion(assertion) for assertion in normalized_assertions]
+                if lean
+                else normalized_assertions
+            ),
+            assertions_by_layer=assertions_by_layer,
+            assertions_by_id=projected_by_id,
+            page_size=page_size,
+        )
 
-    assertions_by_person_by_layer_path = (
-        dist_path / "assertions_by_person_by_layer.json"
-    )
-    with assertions_by_person_by_layer_path.open("w", encoding="utf-8") as handle:
-        json.dump(
-            assertions_by_person_by_layer, handle, sort_keys=True, indent=2
+    if search_index:
+        _write_search_index(writer, persons)
+
+    if cards is not None:
+        _write_person_cards(writer, cards, persons_by_id)
+
+    if lean:
+        manifest = dict(manifest)
+        manifest["projection"] = projection
+    if content_addressed:
+        manifest = dict(manifest)
+        manifest["artifacts"] = writer.write_content_addressed(
+            exclude=frozenset({MANIFEST_NAME})
         )
-        handle.write("\n")
+    writer.write_json(MANIFEST_NAME, manifest)
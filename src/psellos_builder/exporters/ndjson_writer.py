@@ -0,0 +1,16 @@
+"""Write compiled records as newline-delimited JSON."""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, TextIO
+
+
+def write_ndjson_records(handle: TextIO, records: Iterable[Any]) -> int:
+    """Write one compact JSON record per line as records arrive; return the count."""
+    count = 0
+    for record in records:
+        handle.write(json.dumps(record, sort_keys=True, separators=(",", ":")))
+        handle.write("\n")
+        count += 1
+    return count
+
@@ -0,0 +1,209 @@
+"""Concurrent publishing of a compiled dist/ directory to a storage backend."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Any, Protocol
+
+from psellos_builder.exporters.dist_writer import MANIFEST_NAME
+
+DEFAULT_CONCURRENCY = 8
+DIRECTORY_INDEX_NAME = "index.json"
+REMOTE_DIGESTS_NAME = ".publish_digests.json"
+READ_CHUNK_SIZE = 1 << 20
+
+
+class PublishBackend(Protocol):
+    """Object-store-style target: a flat namespace of ``/``-separated keys."""
+
+    def remote_digests(self) -> dict[str, str]:
+        """Return key -> sha256 of the objects already published."""
+
+    def upload(self, key: str, source: Path) -> None:
+        """Store ``source`` under ``key``, replacing any existing object."""
+
+    def write_remote_digests(self, digests: dict[str, str]) -> None:
+        """Record the digests of everything published so far."""
+
+
+class LocalDirectoryBackend:
+    """Stand-in for object storage that publishes into a local directory.
+
+    Objects are replaced atomically, and published digests are kept in a
+    ``.publish_digests.json`` record beside them.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def remote_digests(self) -> dict[str, str]:
+        path = self.root / REMOTE_DIGESTS_NAME
+        if not path.exists():
+            return {}
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _replace(self, key: str, write: Any) -> None:
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                write(stream)
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def upload(self, key: str, source: Path) -> None:
+        def copy(stream: Any) -> None:
+            with source.open("rb") as handle:
+                shutil.copyfileobj(handle, stream, READ_CHUNK_SIZE)
+
+        self._replace(key, copy)
+
+    def write_remote_digests(self, digests: dict[str, str]) -> None:
+        payload = (json.dumps(digests, sort_keys=True, indent=2) + "\n").encode()
+        self._replace(REMOTE_DIGESTS_NAME, lambda stream: stream.write(payload))
+
+
+def file_digest(path: Path) -> str:
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def publish_order(keys: list[str]) -> list[list[str]]:
+    """Group keys into upload stages so no file is visible before its targets.
+
+    Data files go first. Then come the ``index.json`` directories that point
+    at pages, shards, and nested directories, one depth level per stage with
+    the deepest first. ``manifest.json`` goes last.
+    """
+    data: list[str] = []
+    directories: dict[int, list[str]] = {}
+    manifest: list[str] = []
+    for key in sorted(keys):
+        path = PurePosixPath(key)
+        if key == MANIFEST_NAME:
+            manifest.append(key)
+        elif path.name == DIRECTORY_INDEX_NAME and len(path.parts) > 1:
+            directories.setdefault(len(path.parts), []).append(key)
+        else:
+            data.append(key)
+    stages = [data]
+    stages.extend(directories[depth] for depth in sorted(directories, reverse=True))
+    stages.append(manifest)
+    return [stage for stage in stages if stage]
+
+
+def publish_dist(
+    *,
+    dist_path: Path,
+    backend: PublishBackend,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, Any]:
+    """Upload changed artifacts concurrently, stage by stage; return a report.
+
+    Files whose sha256 matches the backend's published digest are skipped.
+    Each stage finishes before the next starts, so a reader never sees a
+    directory or manifest pointing at data that has not arrived yet.
+    """
+    if not (dist_path / MANIFEST_NAME).is_file():
+        raise FileNotFoundError(f"{MANIFEST_NAME} was not found in {dist_path}.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    keys = [
+        path.relative_to(dist_path).as_posix()
+        for path in dist_path.rglob("*")
+        if path.is_file()
+    ]
+    remote = backend.remote_digests()
+    published = dict(remote)
+
+    def publish_one(key: str) -> tuple[str, str, int | None]:
+        source = dist_path / key
+        digest = file_digest(source)
+        if remote.get(key) == digest:
+            return key, digest, None
+        backend.upload(key, source)
+        return key, digest, source.stat().st_size
+
+    started = time.perf_counter()
+    uploaded = 0
+    uploaded_bytes = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for stage in publish_order(keys):
+                for key, digest, size in executor.map(publish_one, stage):
+                    published[key] = digest
+                    if size is not None:
+                        uploaded += 1
+                        uploaded_bytes += size
+    finally:
+        backend.write_remote_digests(published)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "files": len(keys),
+        "uploaded": uploaded,
+        "skipped": len(keys) - uploaded,
+        "uploaded_bytes": uploaded_bytes,
+        "seconds": elapsed,
+        "files_per_second": uploaded / elapsed if elapsed else 0.0,
+        "bytes_per_second": uploaded_bytes / elapsed if elapsed else 0.0,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="psellos-builder publish",
+        description=(
+            "Upload a compiled dist/ directory, skipping unchanged files and "
+            "publishing manifest.json last."
+        ),
+    )
+    parser.add_argument("dist", type=Path, help="Compiled dist/ directory.")
+    parser.add_argument(
+        "target", type=Path, help="Target directory standing in for object storage."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of concurrent upload threads.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    report = publish_dist(
+        dist_path=args.dist,
+        backend=LocalDirectoryBackend(args.target),
+        concurrency=args.concurrency,
+    )
+    print(
+        f"{report['uploaded']} of {report['files']} files uploaded "
+        f"({report['skipped']} unchanged) in {report['seconds']:.2f}s"
+    )
+    print(
+        f"{report['files_per_second']:.0f} files/s, "
+        f"{report['bytes_per_second'] / (1024 * 1024):.2f} MiB/s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+"""Write compiled artifacts into an indexed SQLite database."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from psellos_builder.builders.manifest import resolve_person_display_name
+from psellos_builder.layers import get_layer, get_rel_type, normalize_assertion
+
+SQLITE_BATCH_SIZE = 5000
+
+_TABLE_STATEMENTS = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID",
+    """
+    CREATE TABLE persons (
+        id TEXT PRIMARY KEY,
+        display_name TEXT NOT NULL,
+        data TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE assertions (
+        id TEXT PRIMARY KEY,
+        layer TEXT NOT NULL,
+        rel TEXT NOT NULL,
+        predicate TEXT,
+        subject TEXT,
+        object TEXT,
+        data TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE assertion_endpoints (
+        person_id TEXT NOT NULL,
+        layer TEXT NOT NULL,
+        rel TEXT NOT NULL,
+        assertion_id TEXT NOT NULL,
+        role TEXT NOT NULL,
+        PRIMARY KEY (person_id, layer, rel, assertion_id, role)
+    ) WITHOUT ROWID
+    """,
+)
+
+# Created after the bulk load; the endpoint primary key already covers
+# person -> layer -> rel lookups.
+_INDEX_STATEMENTS = (
+    "CREATE INDEX assertions_by_layer_rel ON assertions (layer, rel, id)",
+    "CREATE INDEX assertions_by_subject ON assertions (subject, layer, rel)",
+    "CREATE INDEX assertions_by_object ON assertions (object, layer, rel)",
+    """
+    CREATE INDEX assertion_endpoints_by_layer
+    ON assertion_endpoints (layer, rel, person_id, assertion_id)
+    """,
+    """
+    CREATE INDEX assertion_endpoints_by_assertion
+    ON assertion_endpoints (assertion_id, person_id)
+    """,
+)
+
+
+def _batched(rows: Iterable[tuple[Any, ...]]) -> Iterator[list[tuple[Any, ...]]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, SQLITE_BATCH_SIZE)):
+        yield batch
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _meta_rows(manifest: dict[str, Any]) -> Iterator[tuple[str, str]]:
+    for key in sorted(manifest):
+        if key == "person_index":
+            continue
+        yield key, _dump(manifest[key])
+
+
+def _person_rows(persons: Iterable[dict[str, Any]]) -> Iterator[tuple[str, ...]]:
+    for person in persons:
+        person_id = person["id"]
+        yield (
+            person_id,
+            resolve_person_display_name(person, person_id),
+            _dump(person),
+        )
+
+
+def _assertion_rows(
+    assertions: Iterable[tuple[dict[str, Any], str, str]],
+) -> Iterator[tuple[Any, ...]]:
+    for assertion, layer, rel in assertions:
+        predicate = assertion.get("predicate")
+        yield (
+            assertion["id"],
+            layer,
+            rel,
+            predicate if isinstance(predicate, str) else None,
+            assertion.get("subject"),
+            assertion.get("object"),
+            _dump(assertion),
+        )
+
+
+def _endpoint_rows(
+    assertions: Iterable[tuple[dict[str, Any], str, str]],
+) -> Iterator[tuple[str, ...]]:
+    for assertion, layer, rel in assertions:
+        for role in ("subject", "object"):
+            person_id = assertion.get(role)
+            if isinstance(person_id, str):
+                yield person_id, layer, rel, assertion["id"], role
+
+
+def write_sqlite(
+    *, db_path: Path, manifest: dict[str, Any], dataset: dict[str, Any]
+) -> None:
+    """Export persons, assertions, and endpoint indexes into a SQLite database.
+
+    The database is built in a sibling temporary file inside one transaction
+    and moved into place when complete.
+    """
+    assertions_by_id: dict[str, dict[str, Any]] = {}
+    for assertion in dataset.get("assertions", []):
+        normalized = normalize_assertion(assertion)
+        if isinstance(normalized.get("id"), str):
+            assertions_by_id[normalized["id"]] = normalized
+    classified = [
+        (assertion, get_layer(assertion), get_rel_type(assertion))
+        for assertion in assertions_by_id.values()
+    ]
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = db_path.with_name(db_path.name + ".tmp")
+    temp_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(temp_path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("BEGIN")
+        for statement in _TABLE_STATEMENTS:
+            connection.execute(statement)
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", _meta_rows(manifest))
+        for batch in _batched(_person_rows(dataset.get("persons", []))):
+            connection.executemany("INSERT INTO persons VALUES (?, ?, ?)", batch)
+        for batch in _batched(_assertion_rows(classified)):
+            connection.executemany(
+                "INSERT INTO assertions VALUES (?, ?, ?, ?, ?, ?, ?)", batch
+            )
+        for batch in _batched(_endpoint_rows(classified)):
+            connection.executemany(
+                "INSERT OR IGNORE INTO assertion_endpoints VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+        for statement in _INDEX_STATEMENTS:
+            connection.execute(statement)
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    except BaseException:
+        connection.close()
+        temp_path.unlink(missing_ok=True)
+        raise
+    connection.close()
+    os.replace(temp_path, db_path)
@@ -3,6 +3,27 @@ from __future__ import annotations
 
 from typing import Any
 
+MISSING_REL_TYPE = "(none)"
+
+
+def normalize_endpoint(value: Any) -> str:
+    """Return the person id of a string or ``{"id": ...}`` assertion endpoint."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict) and "id" in value:
+        return str(value["id"])
+    raise ValueError(f"Unexpected assertion endpoint shape: {value!r}")
+
+
+def normalize_assertion(assertion: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of an assertion with its endpoints reduced to person ids."""
+    normalized = dict(assertion)
+    if "subject" in normalized:
+        normalized["subject"] = normalize_endpoint(normalized["subject"])
+    if "object" in normalized:
+        normalized["object"] = normalize_endpoint(normalized["object"])
+    return normalized
+
 
 def get_layer(assertion: dict[str, Any]) -> str:
     """Return the narrative layer for an assertion (defaulting to canon)."""
@@ -16,6 +37,18 @@ def get_layer(assertion: dict[str, Any]) -> str:
     return "canon"
 
 
+def get_rel_type(assertion: dict[str, Any]) -> str:
+    """Return the psellos relation type for an assertion (or ``(none)``)."""
+    extensions = assertion.get("extensions")
+    if isinstance(extensions, dict):
+        psellos = extensions.get("psellos")
+        if isinstance(psellos, dict):
+            rel_type = psellos.get("rel")
+            if isinstance(rel_type, str) and rel_type:
+                return rel_type
+    return MISSING_REL_TYPE
+
+
 def build_assertions_by_layer(
     assertions: list[dict[str, Any]],
 ) -> dict[str, list[str]]:
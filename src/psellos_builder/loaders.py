@@ -0,0 +1,254 @@
+"""Dataset input discovery and loading."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+LAYER_META_SOURCE_NAME = "layers_meta.source.json"
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+DATASET_SUFFIXES = (".json", *NDJSON_SUFFIXES)
+STDIN_PATH = Path("-")
+NDJSON_KINDS = {"person": "persons", "assertion": "assertions"}
+MAX_REPORTED_CONFLICTS = 20
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+class MergedDataset(dict):
+    """A dataset merged from shards, remembering where repeated assertion ids live.
+
+    ``duplicate_assertion_sources`` maps each assertion id defined more than
+    once to the shard paths of every definition, in merge order.
+    """
+
+    def __init__(
+        self, data: dict[str, Any], duplicate_assertion_sources: dict[str, list[str]]
+    ) -> None:
+        super().__init__(data)
+        self.duplicate_assertion_sources = duplicate_assertion_sources
+
+
+def is_glob(input_path: Path) -> bool:
+    """Return True when the input path is a glob pattern."""
+    return any(char in _GLOB_CHARACTERS for char in input_path.as_posix())
+
+
+def dataset_root(input_path: Path) -> Path:
+    """Return the directory holding sidecar files (such as layer metadata)."""
+    if input_path == STDIN_PATH:
+        return Path(".")
+    if is_glob(input_path):
+        parts: list[str] = []
+        for part in input_path.parts:
+            if is_glob(Path(part)):
+                break
+            parts.append(part)
+        return Path(*parts) if parts else Path(".")
+    if input_path.is_dir():
+        return input_path
+    return input_path.parent
+
+
+def _is_dataset_file(path: Path) -> bool:
+    return (
+        path.is_file()
+        and path.suffix in DATASET_SUFFIXES
+        and path.name != LAYER_META_SOURCE_NAME
+    )
+
+
+def resolve_dataset_files(input_path: Path) -> list[Path]:
+    """Expand a dataset directory or glob into a sorted list of shard files."""
+    if is_glob(input_path):
+        root = dataset_root(input_path)
+        candidates = root.glob(input_path.relative_to(root).as_posix())
+    elif input_path.is_dir():
+        candidates = input_path.rglob("*")
+    else:
+        return [input_path]
+    files = sorted(path for path in candidates if _is_dataset_file(path))
+    if not files:
+        raise FileNotFoundError(f"No dataset files found for input: {input_path}")
+    return files
+
+
+def load_ndjson(handle: TextIO, source: object) -> dict[str, Any]:
+    """Load kind-tagged NDJSON records (one person or assertion per line).
+
+    Each non-blank line is an object of the form
+    ``{"kind": "person" | "assertion", "record": {...}}``.
+    """
+    dataset: dict[str, Any] = {"persons": [], "assertions": []}
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(
+                f"Invalid JSON in NDJSON input {source} line {line_number}: {exc}"
+            ) from exc
+        if not isinstance(entry, dict) or "record" not in entry:
+            raise ValueError(
+                f"NDJSON input {source} line {line_number} must be an object "
+                "with 'kind' and 'record'."
+            )
+        key = NDJSON_KINDS.get(entry.get("kind"))
+        if key is None:
+            raise ValueError(
+                f"NDJSON input {source} line {line_number} has unknown kind "
+                f"{entry.get('kind')!r}; expected one of {sorted(NDJSON_KINDS)}."
+            )
+        dataset[key].append(entry["record"])
+    return dataset
+
+
+def load_dataset_file(input_path: Path) -> dict[str, Any]:
+    """Load a single raw dataset JSON or NDJSON file (``-`` reads NDJSON from stdin)."""
+    if input_path == STDIN_PATH:
+        return load_ndjson(sys.stdin, "<stdin>")
+    if not input_path.exists():
+        raise FileNotFoundError(f"Dataset file not found: {input_path}")
+    if not input_path.is_file():
+        raise ValueError(f"Dataset path must be a JSON file: {input_path}")
+    if input_path.suffix in NDJSON_SUFFIXES:
+        with input_path.open("r", encoding="utf-8") as handle:
+            return load_ndjson(handle, input_path)
+    try:
+        with input_path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON in dataset file {input_path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError(f"Dataset root must be a JSON object: {input_path}")
+    return data
+
+
+def _collect_records(
+    *,
+    kind: str,
+    records: Any,
+    path: Path,
+    merged: list[Any],
+    origins: dict[str, Path],
+    conflicts: list[str],
+) -> None:
+    if not isinstance(records, list):
+        raise ValueError(f"'{kind}s' must be an array in dataset file {path}")
+    for record in records:
+        record_id = record.get("id") if isinstance(record, dict) else None
+        if isinstance(record_id, str):
+            if record_id in origins:
+                conflicts.append(
+                    f"{kind} id {record_id!r} in {origins[record_id]} and {path}"
+                )
+            else:
+                origins[record_id] = path
+        merged.append(record)
+
+
+def merge_datasets(shards: list[tuple[Path, dict[str, Any]]]) -> MergedDataset:
+    """Merge dataset shards, rejecting person ids defined more than once.
+
+    Duplicate assertion ids are kept, as they are in a single file, and their
+    shard paths are passed on to the integrity report.
+    """
+    persons: list[Any] = []
+    assertions: list[Any] = []
+    person_origins: dict[str, Path] = {}
+    assertion_origins: dict[str, Path] = {}
+    assertion_sources: dict[str, list[str]] = {}
+    conflicts: list[str] = []
+    merged: dict[str, Any] = {}
+    extra_origins: dict[str, Path] = {}
+    for path, shard in shards:
+        _collect_records(
+            kind="person",
+            records=shard.get("persons", []),
+            path=path,
+            merged=persons,
+            origins=person_origins,
+            conflicts=conflicts,
+        )
+        shard_assertions = shard.get("assertions", [])
+        if not isinstance(shard_assertions, list):
+            raise ValueError(f"'assertions' must be an array in dataset file {path}")
+        for assertion in shard_assertions:
+            assertion_id = assertion.get("id") if isinstance(assertion, dict) else None
+            if isinstance(assertion_id, str):
+                origin = assertion_origins.get(assertion_id)
+                if origin is None:
+                    assertion_origins[assertion_id] = path
+                else:
+                    assertion_sources.setdefault(
+                        assertion_id, [origin.as_posix()]
+                    ).append(path.as_posix())
+            assertions.append(assertion)
+        for key, value in shard.items():
+            if key in ("persons", "assertions"):
+                continue
+            if key in merged and merged[key] != value:
+                conflicts.append(
+                    f"top-level {key!r} differs in {extra_origins[key]} and {path}"
+                )
+                continue
+            merged.setdefault(key, value)
+            extra_origins.setdefault(key, path)
+    if conflicts:
+        shown = conflicts[:MAX_REPORTED_CONFLICTS]
+        more = len(conflicts) - len(shown)
+        lines = "\n".join(f"  - {conflict}" for conflict in shown)
+        if more:
+            lines += f"\n  ... and {more} more"
+        raise ValueError(f"Conflicting dataset shards:\n{lines}")
+    merged["persons"] = persons
+    merged["assertions"] = assertions
+    return MergedDataset(merged, assertion_sources)
+
+
+def resolve_workers(workers: int | None, task_count: int) -> int:
+    """Clamp a worker count (defaulting to the CPU count) to ``1..task_count``."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, task_count))
+
+
+def process_pool(max_workers: int, **options: Any) -> ProcessPoolExecutor:
+    """Return a process pool whose workers are not forked from this process.
+
+    Pools start while executor manager and artifact writer threads may be
+    running, and forking a multi-threaded process can deadlock, so workers
+    come from a ``forkserver`` (or ``spawn`` where that is unavailable).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(method),
+        **options,
+    )
+
+
+def load_dataset_files(
+    paths: list[Path], *, workers: int | None = None
+) -> dict[str, Any]:
+    """Load dataset shards in parallel worker processes and merge them in order."""
+    worker_count = resolve_workers(workers, len(paths))
+    if worker_count == 1:
+        shards = [load_dataset_file(path) for path in paths]
+    else:
+        with process_pool(worker_count) as executor:
+            shards = list(executor.map(load_dataset_file, paths))
+    return merge_datasets(list(zip(paths, shards)))
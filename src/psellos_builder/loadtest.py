@@ -0,0 +1,140 @@
+"""Load test for the local query server."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import quote
+
+DEFAULT_URL = "http://127.0.0.1:8000"
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 16
+DEFAULT_SEED = 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="psellos-builder-loadtest",
+        description="Measure request latency against psellos-builder serve.",
+    )
+    parser.add_argument("url", nargs="?", default=DEFAULT_URL, help="Server base URL.")
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=DEFAULT_REQUESTS,
+        help="Total number of requests to issue.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of concurrent client threads.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help="Seed for request sampling."
+    )
+    return parser
+
+
+def _get(url: str) -> tuple[int, bytes]:
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read()
+
+
+def _get_json(url: str) -> Any:
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def _sample_targets(base_url: str, count: int, seed: int) -> list[str]:
+    manifest = _get_json(f"{base_url}/manifest")
+    layers = _get_json(f"{base_url}/layers")["layers"]
+    person_ids = sorted(manifest.get("person_index", {}))
+    rng = random.Random(seed)
+    targets: list[str] = []
+    for _ in range(count):
+        roll = rng.random()
+        if person_ids and roll < 0.45:
+            targets.append(f"/persons/{quote(rng.choice(person_ids), safe='')}")
+        elif person_ids and roll < 0.9:
+            person_id = quote(rng.choice(person_ids), safe="")
+            layer = rng.choice(layers) if layers and rng.random() < 0.5 else None
+            suffix = f"?layer={quote(layer, safe='')}" if layer else ""
+            targets.append(f"/persons/{person_id}/neighborhood{suffix}")
+        elif layers:
+            targets.append(f"/layers/{quote(rng.choice(layers), safe='')}")
+        else:
+            targets.append("/layers")
+    return targets
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def run_load_test(
+    *, base_url: str, requests: int, concurrency: int, seed: int = DEFAULT_SEED
+) -> dict[str, Any]:
+    """Issue sampled requests concurrently and return latency statistics."""
+    base_url = base_url.rstrip("/")
+    targets = _sample_targets(base_url, requests, seed)
+
+    def timed(target: str) -> tuple[float, int]:
+        started = time.perf_counter()
+        status, _ = _get(base_url + target)
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, targets))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_second": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p90_ms": _percentile(latencies, 0.90) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    report = run_load_test(
+        base_url=args.url,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+    print(
+        f"{report['requests']} requests in {report['seconds']:.2f}s "
+        f"({report['requests_per_second']:.0f} req/s), {report['errors']} errors"
+    )
+    print(
+        f"p50 {report['p50_ms']:.2f} ms  p90 {report['p90_ms']:.2f} ms  "
+        f"p99 {report['p99_ms']:.2f} ms  max {report['max_ms']:.2f} ms"
+    )
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
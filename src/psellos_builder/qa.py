@@ -7,10 +7,6 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
-from psellos_builder.builders.manifest import build_manifest
-from psellos_builder.exporters.dist_writer import write_dist
-from psellos_builder.validators.schema import validate_schema
-
 DEFAULT_SPEC = Path("../psellos-spec/schema.json")
 DEFAULT_FIXTURE = Path("../psellos-data/fixture.json")
 
@@ -168,6 +164,10 @@ def _validate_assertions_by_id(
 
 
 def run_check(*, input_path: Path, spec_path: Path, dist_path: Path) -> None:
+    from psellos_builder.builders.manifest import build_manifest
+    from psellos_builder.exporters.dist_writer import write_dist
+    from psellos_builder.validators.schema import validate_schema
+
     dataset = validate_schema(spec_path=spec_path, input_path=input_path)
     manifest = build_manifest(dataset, spec_path=spec_path, input_path=input_path)
     write_dist(
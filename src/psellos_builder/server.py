@@ -0,0 +1,356 @@
+"""Local query server over compiled dist/ artifacts."""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from psellos_builder.builders.manifest import resolve_person_display_name
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 4096
+MIN_GZIP_BYTES = 512
+
+_REQUIRED_ARTIFACTS = (
+    "manifest.json",
+    "persons.json",
+    "assertions_by_id.json",
+    "assertions_by_person.json",
+    "assertions_by_layer.json",
+    "assertions_by_person_by_layer.json",
+    "layers.json",
+    "layer_stats.json",
+)
+_OPTIONAL_ARTIFACTS = ("layers_meta.json",)
+
+
+class NotFound(LookupError):
+    """Raised when a requested resource does not exist."""
+
+
+class DistIndex:
+    """In-memory indexes over a compiled dist/ directory, loaded once."""
+
+    def __init__(self, dist_path: Path) -> None:
+        artifacts: dict[str, Any] = {}
+        digest = hashlib.sha256()
+        for name in (*_REQUIRED_ARTIFACTS, *_OPTIONAL_ARTIFACTS):
+            path = dist_path / name
+            if not path.exists():
+                if name in _OPTIONAL_ARTIFACTS:
+                    continue
+                raise FileNotFoundError(f"{name} was not found in {dist_path}.")
+            raw = path.read_bytes()
+            digest.update(name.encode("utf-8") + b"\0" + raw + b"\0")
+            artifacts[name] = json.loads(raw)
+        self.digest = digest.hexdigest()
+        self.manifest: dict[str, Any] = artifacts["manifest.json"]
+        self.persons: dict[str, Any] = artifacts["persons.json"]
+        self.assertions_by_id: dict[str, Any] = artifacts["assertions_by_id.json"]
+        self.assertions_by_person: dict[str, list[str]] = artifacts[
+            "assertions_by_person.json"
+        ]
+        self.assertions_by_layer: dict[str, list[str]] = artifacts[
+            "assertions_by_layer.json"
+        ]
+        self.assertions_by_person_by_layer: dict[str, dict[str, list[str]]] = (
+            artifacts["assertions_by_person_by_layer.json"]
+        )
+        self.layers: list[str] = artifacts["layers.json"]
+        self.layer_stats: dict[str, Any] = artifacts["layer_stats.json"]
+        self.layers_meta: dict[str, Any] | None = artifacts.get("layers_meta.json")
+        self.projection: str = self.manifest.get("projection", "full")
+        self.assertion_details: dict[str, Any] = {}
+        if self.projection == "lean":
+            # Lean builds keep only core fields in assertions_by_id.json; load
+            # the detail shards so single-assertion lookups return full records.
+            details_path = dist_path / "assertion_details"
+            raw = (details_path / "index.json").read_bytes()
+            digest.update(b"assertion_details/index.json\0" + raw + b"\0")
+            for key in json.loads(raw)["shards"]:
+                raw = (details_path / f"{key}.json").read_bytes()
+                digest.update(f"assertion_details/{key}.json".encode() + b"\0")
+                digest.update(raw + b"\0")
+                self.assertion_details.update(json.loads(raw))
+            self.digest = digest.hexdigest()
+
+    def _display_name(self, person_id: str) -> str:
+        person = self.persons.get(person_id)
+        if not isinstance(person, dict):
+            return person_id
+        return resolve_person_display_name(person, person_id)
+
+    def person(self, person_id: str) -> dict[str, Any]:
+        if person_id not in self.persons:
+            raise NotFound(f"Unknown person: {person_id}")
+        return {
+            "person": self.persons[person_id],
+            "assertion_ids": self.assertions_by_person.get(person_id, []),
+            "assertion_ids_by_layer": self.assertions_by_person_by_layer.get(
+                person_id, {}
+            ),
+        }
+
+    def assertion(self, assertion_id: str) -> dict[str, Any]:
+        assertion = self.assertions_by_id.get(assertion_id)
+        if assertion is None:
+            raise NotFound(f"Unknown assertion: {assertion_id}")
+        detail = self.assertion_details.get(assertion_id)
+        return assertion if detail is None else {**assertion, **detail}
+
+    def layer_list(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"layers": self.layers}
+        if self.layers_meta is not None:
+            payload["meta"] = self.layers_meta.get("layers", [])
+        return payload
+
+    def layer(self, layer_id: str) -> dict[str, Any]:
+        if layer_id not in self.assertions_by_layer:
+            raise NotFound(f"Unknown layer: {layer_id}")
+        stats = {
+            key: value[layer_id]
+            for key, value in self.layer_stats.items()
+            if isinstance(value, dict) and layer_id in value
+        }
+        return {
+            "id": layer_id,
+            "assertion_ids": self.assertions_by_layer[layer_id],
+            "stats": stats,
+        }
+
+    def neighborhood(self, person_id: str, layer: str | None) -> dict[str, Any]:
+        if person_id not in self.persons:
+            raise NotFound(f"Unknown person: {person_id}")
+        if layer is None:
+            assertion_ids = self.assertions_by_person.get(person_id, [])
+        else:
+            assertion_ids = self.assertions_by_person_by_layer.get(
+                person_id, {}
+            ).get(layer, [])
+        assertions = [
+            self.assertions_by_id[assertion_id]
+            for assertion_id in assertion_ids
+            if assertion_id in self.assertions_by_id
+        ]
+        neighbors: set[str] = set()
+        for assertion in assertions:
+            for endpoint in (assertion.get("subject"), assertion.get("object")):
+                if isinstance(endpoint, str) and endpoint != person_id:
+                    neighbors.add(endpoint)
+        payload = {
+            "person_id": person_id,
+            "layer": layer,
+            "assertions": assertions,
+            "neighbors": {
+                neighbor: self._display_name(neighbor)
+                for neighbor in sorted(neighbors)
+            },
+        }
+        if self.projection != "full":
+            # Neighborhood assertions stay lean; full records are per assertion.
+            payload["projection"] = self.projection
+        return payload
+
+
+class Response:
+    """A cached JSON response body with its optional gzip encoding."""
+
+    __slots__ = ("status", "body", "gzipped")
+
+    def __init__(self, status: HTTPStatus, payload: Any) -> None:
+        self.status = status
+        self.body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        self.gzipped = (
+            gzip.compress(self.body, mtime=0)
+            if len(self.body) >= MIN_GZIP_BYTES
+            else None
+        )
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of rendered responses keyed by request target."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, Response] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Response | None:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: Response) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class QueryService:
+    """Route request targets to index lookups, with caching and ETags."""
+
+    def __init__(self, index: DistIndex, *, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.index = index
+        self.cache = ResponseCache(cache_size)
+
+    def etag(self, target: str) -> str:
+        token = hashlib.sha256(
+            f"{self.index.digest}\0{target}".encode("utf-8")
+        ).hexdigest()
+        return f'"{token[:32]}"'
+
+    def respond(self, target: str) -> Response:
+        cached = self.cache.get(target)
+        if cached is not None:
+            return cached
+        try:
+            response = Response(HTTPStatus.OK, self._route(target))
+        except NotFound as exc:
+            response = Response(HTTPStatus.NOT_FOUND, {"error": str(exc)})
+        self.cache.put(target, response)
+        return response
+
+    def _route(self, target: str) -> Any:
+        parts = urlsplit(target)
+        segments = [unquote(part) for part in parts.path.split("/") if part]
+        query = parse_qs(parts.query)
+        match segments:
+            case ["manifest"]:
+                return self.index.manifest
+            case ["layers"]:
+                return self.index.layer_list()
+            case ["layers", layer_id]:
+                return self.index.layer(layer_id)
+            case ["persons", person_id]:
+                return self.index.person(person_id)
+            case ["persons", person_id, "neighborhood"]:
+                layer = query.get("layer", [None])[0]
+                return self.index.neighborhood(person_id, layer)
+            case ["assertions", assertion_id]:
+                return self.index.assertion(assertion_id)
+        raise NotFound(f"Unknown route: {parts.path}")
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving JSON responses from a QueryService."""
+
+    server_version = "psellos-builder"
+    service: QueryService
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        etag = self.service.etag(self.path)
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        response = self.service.respond(self.path)
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Vary", "Accept-Encoding")
+        if response.status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+        if accepts_gzip and response.gzipped is not None:
+            body = response.gzipped
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+def create_server(
+    *,
+    dist_path: Path,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    quiet: bool = False,
+) -> ThreadingHTTPServer:
+    """Load dist/ once and return an HTTP server answering lookups from memory."""
+    service = QueryService(DistIndex(dist_path), cache_size=cache_size)
+    handler = type(
+        "BoundQueryRequestHandler", (QueryRequestHandler,), {"service": service}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet  # type: ignore[attr-defined]
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="psellos-builder serve",
+        description="Serve person, assertion, layer, and neighborhood lookups from dist/.",
+    )
+    parser.add_argument(
+        "dist",
+        nargs="?",
+        type=Path,
+        default=Path("dist"),
+        help="Compiled dist/ directory to serve.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind.")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Maximum number of cached responses.",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Disable per-request logging."
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    server = create_server(
+        dist_path=args.dist,
+        host=args.host,
+        port=args.port,
+        cache_size=args.cache_size,
+        quiet=args.quiet,
+    )
+    host, port = server.server_address[:2]
+    print(f"Serving {args.dist} on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
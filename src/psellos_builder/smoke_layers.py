@@ -8,8 +8,6 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
-from psellos_builder.builders.compile import compile_dataset
-
 DEFAULT_SPEC = Path("../psellos-spec/schema.json")
 DEFAULT_FIXTURE = Path("../psellos-data/fixture.json")
 
@@ -86,6 +84,8 @@ def _validate_layers_json(path: Path, expected_layers: list[str]) -> None:
 
 
 def run_smoke(*, input_path: Path, spec_path: Path, dist_path: Path) -> None:
+    from psellos_builder.builders.compile import compile_dataset
+
     compile_dataset(spec_path=spec_path, input_path=input_path, dist_path=dist_path)
     layers = _validate_assertions_by_layer(dist_path / "assertions_by_layer.json")
     _validate_layers_json(dist_path / "layers.json", layers)
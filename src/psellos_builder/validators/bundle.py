@@ -0,0 +1,194 @@
+"""Pre-resolved schema bundles for fast validator startup.
+
+A bundle is a single cached JSON file holding the root schema, every
+referenced schema document, the resolved schema digest, and the stat
+signature of each source file. While the sources are unchanged, builds load
+the bundle instead of re-reading and re-resolving each referenced schema.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from psellos_builder.validators.compiler import (
+    COMPILER_VERSION,
+    SCHEMA_CACHE_ENV,
+    SchemaResolver,
+    UnsupportedSchemaError,
+    default_cache_dir,
+    load_compiled_validator,
+    write_atomic,
+)
+from psellos_builder.validators.schema import (
+    load_referenced_schema,
+    load_schema,
+    schema_path_for_uri,
+)
+
+BUNDLE_VERSION = "1"
+BUNDLE_PREFIX = "schema_bundle_"
+
+
+class SchemaBundle:
+    """A root schema with its referenced documents keyed by URI."""
+
+    def __init__(
+        self,
+        *,
+        schema: Any,
+        schema_dir: Path | None,
+        documents: dict[str, Any],
+        digest: str,
+    ) -> None:
+        self.schema = schema
+        self.schema_dir = schema_dir
+        self.documents = documents
+        self.digest = digest
+
+    def retrieve(self, uri: str) -> Any:
+        """Return a bundled document, reading from disk only for unbundled URIs."""
+        document = self.documents.get(uri.split("#", 1)[0])
+        if document is not None:
+            return document
+        return load_referenced_schema(uri, self.schema_dir)
+
+
+def bundle_path(spec_path: Path, *, cache_dir: Path | None = None) -> Path:
+    """Return the cache location of the bundle for ``spec_path``."""
+    key = hashlib.sha256(str(spec_path.resolve()).encode("utf-8")).hexdigest()
+    return (cache_dir or default_cache_dir()) / f"{BUNDLE_PREFIX}{key[:32]}.json"
+
+
+def _stat_signature(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _root_sources(spec_path: Path) -> list[Path]:
+    if spec_path.is_dir():
+        # The directory mtime changes when schema.json appears or disappears.
+        return [spec_path, spec_path / "schema.json"]
+    return [spec_path]
+
+
+def _build_bundle(spec_path: Path) -> tuple[SchemaBundle, dict[str, Any]]:
+    schema, schema_dir = load_schema(spec_path)
+    sources = _root_sources(spec_path)
+
+    def retrieve(uri: str) -> Any:
+        document = load_referenced_schema(uri, schema_dir)
+        if schema_dir is not None:
+            source = schema_path_for_uri(uri, schema_dir)
+            if source is not None:
+                sources.append(source)
+        return document
+
+    resolver = SchemaResolver(schema, retrieve)
+    bundle = SchemaBundle(
+        schema=schema,
+        schema_dir=schema_dir,
+        documents=resolver.documents,
+        digest=resolver.digest(),
+    )
+    payload = {
+        "bundle_version": BUNDLE_VERSION,
+        "compiler_version": COMPILER_VERSION,
+        "root_uri": resolver.root_uri,
+        "schema_dir": None if schema_dir is None else str(schema_dir),
+        "sources": [
+            [str(source), _stat_signature(source)] for source in dict.fromkeys(sources)
+        ],
+        "digest": bundle.digest,
+        "documents": resolver.documents,
+    }
+    return bundle, payload
+
+
+def _read_fresh_bundle(path: Path) -> SchemaBundle | None:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("bundle_version") != BUNDLE_VERSION
+        or payload.get("compiler_version") != COMPILER_VERSION
+    ):
+        return None
+    for source, signature in payload["sources"]:
+        if _stat_signature(Path(source)) != signature:
+            return None
+    schema_dir = payload["schema_dir"]
+    documents = payload["documents"]
+    return SchemaBundle(
+        schema=documents[payload["root_uri"]],
+        schema_dir=None if schema_dir is None else Path(schema_dir),
+        documents=documents,
+        digest=payload["digest"],
+    )
+
+
+def write_schema_bundle(spec_path: Path, *, cache_dir: Path | None = None) -> Path:
+    """Resolve the schema and its references and write the cached bundle."""
+    _, payload = _build_bundle(spec_path)
+    path = bundle_path(spec_path, cache_dir=cache_dir)
+    write_atomic(path, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+    return path
+
+
+def load_schema_bundle(
+    spec_path: Path, *, cache_dir: Path | None = None
+) -> SchemaBundle:
+    """Return the cached bundle for ``spec_path``, rebuilding it when stale."""
+    path = bundle_path(spec_path, cache_dir=cache_dir)
+    bundle = _read_fresh_bundle(path)
+    if bundle is not None:
+        return bundle
+    bundle, payload = _build_bundle(spec_path)
+    try:
+        write_atomic(path, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+    except OSError:
+        pass
+    return bundle
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="psellos-builder bundle-schema",
+        description=(
+            "Resolve a schema and all of its references into a single cached bundle "
+            f"and precompile its validator (cache: ${SCHEMA_CACHE_ENV})."
+        ),
+    )
+    parser.add_argument(
+        "--spec", type=Path, required=True, help="Path to psellos-spec v0.1.0 schema."
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.spec.exists():
+        raise FileNotFoundError(f"Spec path not found: {args.spec}")
+    path = write_schema_bundle(args.spec)
+    bundle = load_schema_bundle(args.spec)
+    try:
+        load_compiled_validator(
+            bundle.schema, retrieve=bundle.retrieve, digest=bundle.digest
+        )
+    except UnsupportedSchemaError:
+        print("Schema uses keywords outside the compiled subset; bundled only.")
+    print(f"Wrote schema bundle {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
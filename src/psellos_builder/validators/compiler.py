@@ -0,0 +1,737 @@
+"""Compile psellos-spec JSON Schemas into specialized Python validators.
+
+The compiler resolves every ``$ref`` once, then generates a Python module with
+one function per reachable subschema. Keyword checks are emitted in schema
+order so the first reported error matches ``Draft202012Validator``. Generated
+modules are cached on disk by the digest of the resolved schema documents.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+from urllib.parse import unquote, urldefrag, urljoin
+
+COMPILER_VERSION = "1"
+SCHEMA_CACHE_ENV = "PSELLOS_SCHEMA_CACHE_DIR"
+VALIDATOR_MODULE_PREFIX = "validator_"
+
+ValidationResult = tuple[list[Any], str] | None
+CompiledValidator = Callable[[Any], ValidationResult]
+
+_SCHEMA_MAP_KEYWORDS = (
+    "$defs",
+    "definitions",
+    "properties",
+    "patternProperties",
+    "dependentSchemas",
+)
+_SCHEMA_LIST_KEYWORDS = ("allOf", "anyOf", "oneOf", "prefixItems")
+_SCHEMA_VALUE_KEYWORDS = (
+    "items",
+    "additionalProperties",
+    "contains",
+    "propertyNames",
+    "not",
+    "if",
+    "then",
+    "else",
+)
+_UNSUPPORTED_KEYWORDS = frozenset(
+    {"$dynamicRef", "$recursiveRef", "unevaluatedItems", "unevaluatedProperties"}
+)
+_TYPE_CHECKS = {
+    "object": "isinstance(value, dict)",
+    "array": "isinstance(value, list)",
+    "string": "isinstance(value, str)",
+    "boolean": "isinstance(value, bool)",
+    "null": "value is None",
+    "number": "(isinstance(value, (int, float)) and not isinstance(value, bool))",
+    "integer": (
+        "((isinstance(value, int) and not isinstance(value, bool))"
+        " or (isinstance(value, float) and value.is_integer()))"
+    ),
+}
+_IS_NUMBER = _TYPE_CHECKS["number"]
+
+_RUNTIME = """
+import json
+import re
+from fractions import Fraction
+
+
+def _equal(one, two):
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(_equal(a, b) for a, b in zip(one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    return one == two
+
+
+def _unique(items):
+    if all(isinstance(item, str) for item in items):
+        return len(set(items)) == len(items)
+    seen = []
+    for item in items:
+        for other in seen:
+            if _equal(item, other):
+                return False
+        seen.append(item)
+    return True
+
+
+def _not_multiple(value, divisor):
+    if isinstance(divisor, float):
+        quotient = value / divisor
+        try:
+            return int(quotient) != quotient
+        except OverflowError:
+            return (Fraction(value) / Fraction(divisor)).denominator != 1
+    return bool(value % divisor)
+
+
+def _extras(extras):
+    verb = "was" if len(extras) == 1 else "were"
+    return ", ".join(repr(extra) for extra in extras), verb
+"""
+
+
+class UnsupportedSchemaError(ValueError):
+    """Raised when a schema uses keywords outside the compiled subset."""
+
+
+def _join_uri(base: str, ref: str) -> str:
+    if ref.startswith("#"):
+        return urldefrag(base)[0] + ref
+    return urljoin(base, ref)
+
+
+def _iter_subschemas(schema: dict[str, Any]):
+    for keyword in _SCHEMA_MAP_KEYWORDS:
+        value = schema.get(keyword)
+        if isinstance(value, dict):
+            yield from value.values()
+    for keyword in _SCHEMA_LIST_KEYWORDS:
+        value = schema.get(keyword)
+        if isinstance(value, list):
+            yield from value
+    for keyword in _SCHEMA_VALUE_KEYWORDS:
+        if keyword in schema:
+            yield schema[keyword]
+
+
+class SchemaResolver:
+    """Resolve a root schema and every referenced schema document exactly once."""
+
+    def __init__(self, schema: Any, retrieve: Callable[[str], Any]) -> None:
+        self._retrieve = retrieve
+        self.documents: dict[str, Any] = {}
+        self._resources: dict[str, Any] = {}
+        self._anchors: dict[tuple[str, str], Any] = {}
+        root_id = schema.get("$id", "") if isinstance(schema, dict) else ""
+        self.root_uri = urldefrag(root_id)[0]
+        self._register(schema, self.root_uri)
+        self._resolve_all(schema)
+
+    def _register(self, document: Any, uri: str) -> None:
+        self.documents[uri] = document
+        self._resources[uri] = document
+        pending = [(document, uri)]
+        while pending:
+            schema, base = pending.pop()
+            if not isinstance(schema, dict):
+                continue
+            if "$id" in schema and isinstance(schema["$id"], str):
+                base = urldefrag(urljoin(base, schema["$id"]))[0]
+                self._resources.setdefault(base, schema)
+            anchor = schema.get("$anchor")
+            if isinstance(anchor, str):
+                self._anchors[(base, anchor)] = schema
+            pending.extend((subschema, base) for subschema in _iter_subschemas(schema))
+
+    def _document(self, uri: str) -> Any:
+        if uri not in self._resources:
+            document = self._retrieve(uri)
+            self._register(document, uri)
+        return self._resources[uri]
+
+    def resolve(self, ref: str, base: str) -> tuple[Any, str]:
+        """Return the schema a ``$ref`` points to and its base URI."""
+        uri, fragment = urldefrag(_join_uri(base, ref))
+        target = self._document(uri)
+        if fragment and not fragment.startswith("/"):
+            anchored = self._anchors.get((uri, fragment))
+            if anchored is None:
+                raise ValueError(f"Unresolvable schema anchor: {ref}")
+            return anchored, uri
+        base = uri
+        for part in fragment.split("/")[1:]:
+            part = unquote(part).replace("~1", "/").replace("~0", "~")
+            try:
+                target = target[int(part)] if isinstance(target, list) else target[part]
+            except (KeyError, IndexError, ValueError, TypeError) as exc:
+                raise ValueError(f"Unresolvable schema reference: {ref}") from exc
+            if isinstance(target, dict) and isinstance(target.get("$id"), str):
+                base = urldefrag(urljoin(base, target["$id"]))[0]
+        return target, base
+
+    def _resolve_all(self, schema: Any) -> None:
+        seen: set[int] = set()
+        pending = [(schema, self.root_uri)]
+        while pending:
+            current, base = pending.pop()
+            if not isinstance(current, dict) or id(current) in seen:
+                continue
+            seen.add(id(current))
+            if isinstance(current.get("$id"), str):
+                base = urldefrag(urljoin(base, current["$id"]))[0]
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                pending.append(self.resolve(ref, base))
+            pending.extend((subschema, base) for subschema in _iter_subschemas(current))
+
+    def digest(self) -> str:
+        """Return a digest of the compiler version and all resolved documents."""
+        payload = {"compiler": COMPILER_VERSION, "documents": self.documents}
+        encoded = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+
+class _CodeGenerator:
+    def __init__(self, resolver: SchemaResolver) -> None:
+        self._resolver = resolver
+        self._names: dict[int, str] = {}
+        self._pending: list[tuple[Any, str, str]] = []
+        self._constants: list[str] = []
+        self._functions: list[str] = []
+
+    def generate(self, schema: Any, digest: str) -> str:
+        entry = self._function_for(schema, self._resolver.root_uri)
+        while self._pending:
+            self._functions.append(self._compile_function(*self._pending.pop()))
+        parts = [
+            f"# Generated by psellos-builder schema compiler {COMPILER_VERSION}.",
+            f"# Schema digest: {digest}",
+            _RUNTIME,
+            "\n".join(self._constants),
+            "",
+            *self._functions,
+            "def validate(value):",
+            f"    error = {entry}(value)",
+            "    if error is not None:",
+            "        error[0].reverse()",
+            "    return error",
+            "",
+        ]
+        return "\n".join(parts)
+
+    def _function_for(self, schema: Any, base: str) -> str:
+        key = id(schema)
+        name = self._names.get(key)
+        if name is None:
+            name = f"_v{len(self._names)}"
+            self._names[key] = name
+            self._pending.append((schema, base, name))
+        return name
+
+    def _constant(self, expression: str) -> str:
+        name = f"_c{len(self._constants)}"
+        self._constants.append(f"{name} = {expression}")
+        return name
+
+    def _json_constant(self, value: Any) -> str:
+        return self._constant(f"json.loads({json.dumps(value)!r})")
+
+    def _compile_function(self, schema: Any, base: str, name: str) -> str:
+        lines = [f"def {name}(value):"]
+        if schema is True:
+            lines.append("    return None")
+        elif schema is False:
+            lines.append("    return [], 'False schema does not allow ' + repr(value)")
+        elif isinstance(schema, dict):
+            if isinstance(schema.get("$id"), str):
+                base = urldefrag(urljoin(base, schema["$id"]))[0]
+            for keyword, argument in schema.items():
+                if keyword in _UNSUPPORTED_KEYWORDS:
+                    raise UnsupportedSchemaError(
+                        f"Schema keyword {keyword!r} is not supported by the compiler."
+                    )
+                handler = getattr(self, f"_kw_{keyword.lstrip('$')}", None)
+                if handler is not None:
+                    lines.extend(handler(argument, schema, base))
+            lines.append("    return None")
+        else:
+            raise UnsupportedSchemaError(f"Invalid schema node: {schema!r}")
+        return "\n".join(lines) + "\n\n"
+
+    def _descend(
+        self, function: str, target: str, path: str | None, indent: int
+    ) -> list[str]:
+        pad = " " * indent
+        lines = [f"{pad}error = {function}({target})", f"{pad}if error is not None:"]
+        if path is not None:
+            lines.append(f"{pad}    error[0].append({path})")
+        lines.append(f"{pad}    return error")
+        return lines
+
+    def _kw_ref(self, ref: str, schema: dict[str, Any], base: str) -> list[str]:
+        target, target_base = self._resolver.resolve(ref, base)
+        return self._descend(self._function_for(target, target_base), "value", None, 4)
+
+    def _kw_type(self, types: Any, schema: dict[str, Any], base: str) -> list[str]:
+        types = [types] if isinstance(types, str) else list(types)
+        unknown = [entry for entry in types if entry not in _TYPE_CHECKS]
+        if unknown:
+            raise UnsupportedSchemaError(f"Unknown schema types: {unknown!r}")
+        condition = " or ".join(_TYPE_CHECKS[entry] for entry in types)
+        suffix = " is not of type " + ", ".join(repr(entry) for entry in types)
+        return [
+            f"    if not ({condition}):",
+            f"        return [], repr(value) + {suffix!r}",
+        ]
+
+    def _kw_enum(self, enum: list[Any], schema: dict[str, Any], base: str) -> list[str]:
+        suffix = f" is not one of {enum!r}"
+        if all(isinstance(entry, str) for entry in enum):
+            members = self._constant(f"frozenset({sorted(enum)!r})")
+            condition = f"isinstance(value, str) and value in {members}"
+        else:
+            members = self._json_constant(enum)
+            condition = f"any(_equal(value, entry) for entry in {members})"
+        return [
+            f"    if not ({condition}):",
+            f"        return [], repr(value) + {suffix!r}",
+        ]
+
+    def _kw_const(self, const: Any, schema: dict[str, Any], base: str) -> list[str]:
+        expected = self._json_constant(const)
+        return [
+            f"    if not _equal(value, {expected}):",
+            f"        return [], {f'{const!r} was expected'!r}",
+        ]
+
+    def _kw_required(
+        self, required: list[str], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return [
+            "    if isinstance(value, dict):",
+            f"        for name in {tuple(required)!r}:",
+            "            if name not in value:",
+            "                return [], repr(name) + ' is a required property'",
+        ]
+
+    def _kw_properties(
+        self, properties: dict[str, Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines = ["    if isinstance(value, dict):"]
+        for name, subschema in properties.items():
+            function = self._function_for(subschema, base)
+            lines.append(f"        if {name!r} in value:")
+            lines.extend(self._descend(function, f"value[{name!r}]", repr(name), 12))
+        return lines if len(lines) > 1 else []
+
+    def _kw_patternProperties(
+        self, patterns: dict[str, Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines = ["    if isinstance(value, dict):"]
+        for pattern, subschema in patterns.items():
+            compiled = self._constant(f"re.compile({pattern!r})")
+            function = self._function_for(subschema, base)
+            lines.append("        for key, item in value.items():")
+            lines.append(f"            if {compiled}.search(key):")
+            lines.extend(self._descend(function, "item", "key", 16))
+        return lines if len(lines) > 1 else []
+
+    def _kw_additionalProperties(
+        self, additional: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        if additional is True:
+            return []
+        known = self._constant(f"frozenset({sorted(schema.get('properties', {}))!r})")
+        patterns = "|".join(schema.get("patternProperties", {}))
+        condition = f"key not in {known}"
+        if patterns:
+            compiled = self._constant(f"re.compile({patterns!r})")
+            condition += f" and not {compiled}.search(key)"
+        lines = [
+            "    if isinstance(value, dict):",
+            f"        extras = [key for key in value if {condition}]",
+        ]
+        if additional is False:
+            lines.append("        if extras:")
+            if "patternProperties" in schema:
+                regexes = ", ".join(
+                    repr(entry) for entry in sorted(schema["patternProperties"])
+                )
+                lines.extend(
+                    [
+                        "            verb = 'does' if len(extras) == 1 else 'do'",
+                        "            joined = ', '.join(repr(extra) for extra in sorted(extras))",
+                        f"            return [], f'{{joined}} {{verb}} not match any of the regexes: ' + {regexes!r}",
+                    ]
+                )
+            else:
+                lines.append(
+                    "            return [], 'Additional properties are not allowed (%s %s unexpected)'"
+                    " % _extras(sorted(extras, key=str))"
+                )
+            return lines
+        function = self._function_for(additional, base)
+        lines.append("        for key in extras:")
+        lines.extend(self._descend(function, "value[key]", "key", 12))
+        return lines
+
+    def _kw_propertyNames(
+        self, names: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        function = self._function_for(names, base)
+        return [
+            "    if isinstance(value, dict):",
+            "        for key in value:",
+            *self._descend(function, "key", None, 12),
+        ]
+
+    def _kw_items(self, items: Any, schema: dict[str, Any], base: str) -> list[str]:
+        if isinstance(items, list):
+            raise UnsupportedSchemaError(
+                "Array-form 'items' is not supported; use 'prefixItems'."
+            )
+        prefix = len(schema.get("prefixItems", []))
+        if items is False:
+            item_word = "items" if prefix != 1 else "item"
+            return [
+                f"    if isinstance(value, list) and len(value) > {prefix}:",
+                f"        extra = len(value) - {prefix}",
+                f"        rest = value[{prefix}:] if extra != 1 else value[{prefix}]",
+                f"        return [], f'Expected at most {prefix} {item_word} but found {{extra}} extra: {{rest!r}}'",
+            ]
+        function = self._function_for(items, base)
+        return [
+            "    if isinstance(value, list):",
+            f"        for index in range({prefix}, len(value)):",
+            *self._descend(function, "value[index]", "index", 12),
+        ]
+
+    def _kw_prefixItems(
+        self, prefix_items: list[Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines = ["    if isinstance(value, list):"]
+        for index, subschema in enumerate(prefix_items):
+            function = self._function_for(subschema, base)
+            lines.append(f"        if len(value) > {index}:")
+            lines.extend(self._descend(function, f"value[{index}]", str(index), 12))
+        return lines if len(lines) > 1 else []
+
+    def _kw_contains(
+        self, contains: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        function = self._function_for(contains, base)
+        minimum = schema.get("minContains", 1)
+        maximum = schema.get("maxContains")
+        maximum_expression = "len(value)" if maximum is None else repr(maximum)
+        return [
+            "    if isinstance(value, list):",
+            "        matches = 0",
+            f"        max_contains = {maximum_expression}",
+            "        for item in value:",
+            f"            if {function}(item) is None:",
+            "                matches += 1",
+            "                if matches > max_contains:",
+            "                    return [], f'Too many items match the given schema (expected at most {max_contains})'",
+            f"        if matches < {minimum!r}:",
+            "            if not matches:",
+            "                return [], repr(value) + ' does not contain items matching the given schema'",
+            f"            return [], f'Too few items match the given schema (expected at least {minimum} but only {{matches}} matched)'",
+        ]
+
+    def _size_check(
+        self, instance_type: str, operator: str, limit: int, message: str
+    ) -> list[str]:
+        return [
+            f"    if {_TYPE_CHECKS[instance_type]} and len(value) {operator} {limit!r}:",
+            f"        return [], repr(value) + {' ' + message!r}",
+        ]
+
+    def _kw_minLength(self, limit: int, schema: dict[str, Any], base: str) -> list[str]:
+        return self._size_check(
+            "string",
+            "<",
+            limit,
+            "should be non-empty" if limit == 1 else "is too short",
+        )
+
+    def _kw_maxLength(self, limit: int, schema: dict[str, Any], base: str) -> list[str]:
+        return self._size_check(
+            "string",
+            ">",
+            limit,
+            "is expected to be empty" if limit == 0 else "is too long",
+        )
+
+    def _kw_minItems(self, limit: int, schema: dict[str, Any], base: str) -> list[str]:
+        return self._size_check(
+            "array", "<", limit, "should be non-empty" if limit == 1 else "is too short"
+        )
+
+    def _kw_maxItems(self, limit: int, schema: dict[str, Any], base: str) -> list[str]:
+        return self._size_check(
+            "array",
+            ">",
+            limit,
+            "is expected to be empty" if limit == 0 else "is too long",
+        )
+
+    def _kw_minProperties(
+        self, limit: int, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return self._size_check(
+            "object",
+            "<",
+            limit,
+            "should be non-empty" if limit == 1 else "does not have enough properties",
+        )
+
+    def _kw_maxProperties(
+        self, limit: int, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return self._size_check(
+            "object",
+            ">",
+            limit,
+            "is expected to be empty" if limit == 0 else "has too many properties",
+        )
+
+    def _kw_uniqueItems(
+        self, unique: bool, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        if not unique:
+            return []
+        return [
+            "    if isinstance(value, list) and not _unique(value):",
+            "        return [], repr(value) + ' has non-unique elements'",
+        ]
+
+    def _kw_pattern(self, pattern: str, schema: dict[str, Any], base: str) -> list[str]:
+        compiled = self._constant(f"re.compile({pattern!r})")
+        return [
+            f"    if isinstance(value, str) and not {compiled}.search(value):",
+            f"        return [], repr(value) + {f' does not match {pattern!r}'!r}",
+        ]
+
+    def _bound_check(self, operator: str, limit: Any, message: str) -> list[str]:
+        return [
+            f"    if {_IS_NUMBER} and value {operator} {limit!r}:",
+            f"        return [], repr(value) + {f' {message} {limit!r}'!r}",
+        ]
+
+    def _kw_minimum(self, limit: Any, schema: dict[str, Any], base: str) -> list[str]:
+        return self._bound_check("<", limit, "is less than the minimum of")
+
+    def _kw_maximum(self, limit: Any, schema: dict[str, Any], base: str) -> list[str]:
+        return self._bound_check(">", limit, "is greater than the maximum of")
+
+    def _kw_exclusiveMinimum(
+        self, limit: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return self._bound_check("<=", limit, "is less than or equal to the minimum of")
+
+    def _kw_exclusiveMaximum(
+        self, limit: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return self._bound_check(
+            ">=", limit, "is greater than or equal to the maximum of"
+        )
+
+    def _kw_multipleOf(
+        self, divisor: Any, schema: dict[str, Any], base: str
+    ) -> list[str]:
+        return [
+            f"    if {_IS_NUMBER} and _not_multiple(value, {divisor!r}):",
+            f"        return [], repr(value) + {f' is not a multiple of {divisor}'!r}",
+        ]
+
+    def _kw_dependentRequired(
+        self, dependencies: dict[str, list[str]], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines = ["    if isinstance(value, dict):"]
+        for name, required in dependencies.items():
+            lines.append(f"        if {name!r} in value:")
+            lines.append(f"            for other in {tuple(required)!r}:")
+            lines.append("                if other not in value:")
+            lines.append(
+                f"                    return [], repr(other) + {f' is a dependency of {name!r}'!r}"
+            )
+        return lines if len(lines) > 1 else []
+
+    def _kw_dependentSchemas(
+        self, dependencies: dict[str, Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines = ["    if isinstance(value, dict):"]
+        for name, subschema in dependencies.items():
+            lines.append(f"        if {name!r} in value:")
+            lines.extend(
+                self._descend(self._function_for(subschema, base), "value", None, 12)
+            )
+        return lines if len(lines) > 1 else []
+
+    def _kw_allOf(
+        self, subschemas: list[Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        lines: list[str] = []
+        for subschema in subschemas:
+            lines.extend(
+                self._descend(self._function_for(subschema, base), "value", None, 4)
+            )
+        return lines
+
+    def _kw_anyOf(
+        self, subschemas: list[Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        checks = " and ".join(
+            f"{self._function_for(subschema, base)}(value) is not None"
+            for subschema in subschemas
+        )
+        return [
+            f"    if {checks}:",
+            "        return [], repr(value) + ' is not valid under any of the given schemas'",
+        ]
+
+    def _kw_oneOf(
+        self, subschemas: list[Any], schema: dict[str, Any], base: str
+    ) -> list[str]:
+        functions = ", ".join(
+            self._function_for(subschema, base) for subschema in subschemas
+        )
+        reprs = self._constant(repr(tuple(repr(subschema) for subschema in subschemas)))
+        return [
+            f"    valid = [index for index, check in enumerate(({functions},)) if check(value) is None]",
+            "    if not valid:",
+            "        return [], repr(value) + ' is not valid under any of the given schemas'",
+            "    if len(valid) > 1:",
+            f"        reprs = ', '.join([{reprs}[index] for index in valid[1:]] + [{reprs}[valid[0]]])",
+            "        return [], repr(value) + ' is valid under each of ' + reprs",
+        ]
+
+    def _kw_not(self, negated: Any, schema: dict[str, Any], base: str) -> list[str]:
+        function = self._function_for(negated, base)
+        return [
+            f"    if {function}(value) is None:",
+            f"        return [], repr(value) + {f' should not be valid under {negated!r}'!r}",
+        ]
+
+    def _kw_if(self, condition: Any, schema: dict[str, Any], base: str) -> list[str]:
+        lines = [f"    if {self._function_for(condition, base)}(value) is None:"]
+        if "then" in schema:
+            lines.extend(
+                self._descend(
+                    self._function_for(schema["then"], base), "value", None, 8
+                )
+            )
+        else:
+            lines.append("        pass")
+        if "else" in schema:
+            lines.append("    else:")
+            lines.extend(
+                self._descend(
+                    self._function_for(schema["else"], base), "value", None, 8
+                )
+            )
+        return lines
+
+
+def compile_validator_source(resolver: SchemaResolver, schema: Any) -> str:
+    """Generate Python source for a validator specialized to ``schema``."""
+    return _CodeGenerator(resolver).generate(schema, resolver.digest())
+
+
+def default_cache_dir() -> Path:
+    """Return the schema cache directory, honouring ``$PSELLOS_SCHEMA_CACHE_DIR``."""
+    configured = os.environ.get(SCHEMA_CACHE_ENV)
+    if configured:
+        return Path(configured)
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    root = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return root / "psellos-builder"
+
+
+def _exec_source(source: str, name: str) -> ModuleType:
+    module = ModuleType(name)
+    exec(compile(source, f"<{name}>", "exec"), module.__dict__)
+    return module
+
+
+def _import_module(path: Path, name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load compiled validator: {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_atomic(path: Path, source: str) -> None:
+    """Write text through a temporary file so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            stream.write(source)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+_LOADED: dict[str, CompiledValidator] = {}
+
+
+def load_compiled_validator(
+    schema: Any,
+    *,
+    retrieve: Callable[[str], Any],
+    cache_dir: Path | None = None,
+    digest: str | None = None,
+) -> CompiledValidator:
+    """Return a compiled validator for ``schema``, reusing the on-disk cache.
+
+    The validator returns ``None`` for valid instances, or ``(path, message)``
+    for the first error in ``Draft202012Validator`` order. A ``digest`` known
+    from a schema bundle skips resolving references when the validator is
+    already cached.
+    """
+    resolver = None
+    if digest is None:
+        resolver = SchemaResolver(schema, retrieve)
+        digest = resolver.digest()
+    loaded = _LOADED.get(digest)
+    if loaded is not None:
+        return loaded
+    name = f"{VALIDATOR_MODULE_PREFIX}{digest[:32]}"
+    path = (cache_dir or default_cache_dir()) / f"{name}.py"
+    if path.exists():
+        module = _import_module(path, name)
+    else:
+        if resolver is None:
+            resolver = SchemaResolver(schema, retrieve)
+        source = compile_validator_source(resolver, schema)
+        try:
+            write_atomic(path, source)
+        except OSError:
+            module = _exec_source(source, name)
+        else:
+            module = _import_module(path, name)
+    _LOADED[digest] = module.validate
+    return module.validate
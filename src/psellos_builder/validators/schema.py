@@ -1,12 +1,22 @@
 """Schema validation against psellos-spec v0.1.0."""
 from __future__ import annotations
 
-import importlib.util
 import json
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
+from psellos_builder.loaders import (
+    is_glob,
+    load_dataset_file,
+    load_dataset_files,
+    resolve_dataset_files,
+)
+from psellos_builder.validators.compiler import (
+    UnsupportedSchemaError,
+    load_compiled_validator,
+)
+
 SPEC_VERSION = "v0.1.0"
 
 MINIMAL_SCHEMA: dict[str, Any] = {
@@ -42,20 +52,11 @@ MINIMAL_SCHEMA: dict[str, Any] = {
 }
 
 
-def load_dataset(input_path: Path) -> dict[str, Any]:
-    """Load the raw dataset JSON file."""
-    if not input_path.exists():
-        raise FileNotFoundError(f"Dataset file not found: {input_path}")
-    if not input_path.is_file():
-        raise ValueError(f"Dataset path must be a JSON file: {input_path}")
-    try:
-        with input_path.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except json.JSONDecodeError as exc:
-        raise ValueError(f"Invalid JSON in dataset file {input_path}: {exc}") from exc
-    if not isinstance(data, dict):
-        raise ValueError("Dataset root must be a JSON object.")
-    return data
+def load_dataset(input_path: Path, *, workers: int | None = None) -> dict[str, Any]:
+    """Load the raw dataset from a JSON file, a directory, or a glob of shards."""
+    if is_glob(input_path) or input_path.is_dir():
+        return load_dataset_files(resolve_dataset_files(input_path), workers=workers)
+    return load_dataset_file(input_path)
 
 
 def load_schema(spec_path: Path) -> tuple[dict[str, Any], Path | None]:
@@ -71,7 +72,8 @@ def load_schema(spec_path: Path) -> tuple[dict[str, Any], Path | None]:
     return MINIMAL_SCHEMA, None
 
 
-def _schema_path_for_uri(uri: str, schema_dir: Path) -> Path | None:
+def schema_path_for_uri(uri: str, schema_dir: Path) -> Path | None:
+    """Map a psellos schema URI to its file under ``schema_dir``, if any."""
     base_uri = uri.split("#", 1)[0]
     if not base_uri:
         return None
@@ -84,6 +86,22 @@ def _schema_path_for_uri(uri: str, schema_dir: Path) -> Path | None:
     return None
 
 
+def load_referenced_schema(uri: str, schema_dir: Path | None) -> Any:
+    """Load a referenced psellos schema from the spec directory."""
+    candidate = None if schema_dir is None else schema_path_for_uri(uri, schema_dir)
+    if candidate is None:
+        raise ValueError(f"Unsupported schema reference: {uri}")
+    if not candidate.exists():
+        if candidate.name == "core.snap.v0.1.json":
+            raise FileNotFoundError(
+                "Missing referenced schema core.snap.v0.1.json at "
+                f"{candidate}"
+            )
+        raise FileNotFoundError(f"Referenced schema not found: {candidate}")
+    with candidate.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
 def _format_error_path(error_path: Any) -> str:
     if not error_path:
         return "<root>"
@@ -117,36 +135,52 @@ def _manual_validate(data: dict[str, Any]) -> None:
             raise ValueError(f"assertions[{index}].id must be a string.")
 
 
-def validate_schema(*, spec_path: Path, input_path: Path) -> dict[str, Any]:
+def validate_schema(
+    *, spec_path: Path, input_path: Path, workers: int | None = None
+) -> dict[str, Any]:
     """Validate the input dataset against the psellos-spec JSON schema."""
     if not spec_path.exists():
         raise FileNotFoundError(f"Spec path not found: {spec_path}")
+    data = load_dataset(input_path, workers=workers)
+    validate_dataset(data, spec_path=spec_path)
+    return data
 
-    data = load_dataset(input_path)
-    schema, schema_dir = load_schema(spec_path)
 
-    if importlib.util.find_spec("jsonschema") is None:
-        _manual_validate(data)
-        return data
+def validate_dataset(data: dict[str, Any], *, spec_path: Path) -> None:
+    """Validate an already loaded dataset against the psellos-spec JSON schema."""
+    if not spec_path.exists():
+        raise FileNotFoundError(f"Spec path not found: {spec_path}")
 
-    from jsonschema import Draft202012Validator
-    from referencing import Registry, Resource
+    # Imported here because the bundle module builds on this one.
+    from psellos_builder.validators.bundle import load_schema_bundle
 
-    if schema_dir is not None:
+    bundle = load_schema_bundle(spec_path)
+    schema = bundle.schema
+
+    try:
+        compiled = load_compiled_validator(
+            schema, retrieve=bundle.retrieve, digest=bundle.digest
+        )
+    except UnsupportedSchemaError:
+        compiled = None
+    if compiled is not None:
+        result = compiled(data)
+        if result is not None:
+            path, message = result
+            location = _format_error_path(path)
+            raise ValueError(f"Schema validation error at {location}: {message}")
+        return
+
+    try:
+        from jsonschema import Draft202012Validator
+        from referencing import Registry, Resource
+    except ImportError:
+        _manual_validate(data)
+        return
+
+    if bundle.schema_dir is not None:
         def retrieve(uri: str) -> Resource:
-            candidate = _schema_path_for_uri(uri, schema_dir)
-            if candidate is None:
-                raise ValueError(f"Unsupported schema reference: {uri}")
-            if not candidate.exists():
-                if candidate.name == "core.snap.v0.1.json":
-                    raise FileNotFoundError(
-                        "Missing referenced schema core.snap.v0.1.json at "
-                        f"{candidate}"
-                    )
-                raise FileNotFoundError(f"Referenced schema not found: {candidate}")
-            with candidate.open("r", encoding="utf-8") as handle:
-                contents = json.load(handle)
-            return Resource.from_contents(contents)
+            return Resource.from_contents(bundle.retrieve(uri))
 
         registry = Registry(retrieve=retrieve)
         validator = Draft202012Validator(schema, registry=registry)
@@ -156,4 +190,3 @@ def validate_schema(*, spec_path: Path, input_path: Path) -> dict[str, Any]:
     if error is not None:
         location = _format_error_path(error.path)
         raise ValueError(f"Schema validation error at {location}: {error.message}")
-    return data
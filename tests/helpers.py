@@ -0,0 +1,51 @@
+"""Shared dataset and dist fixtures for the test suite."""
+import sys
+from pathlib import Path
+from typing import Any, Sequence
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.builders.manifest import build_manifest
+from psellos_builder.exporters.dist_writer import write_dist
+
+
+def make_dataset(
+    person_count: int, assertion_count: int, *, layers: Sequence[str] = ()
+) -> dict:
+    """Return persons P0.. and "knows" assertions A0.. linking P(i) to P(i + 2).
+
+    With ``layers``, assertions cycle through them as their psellos layer.
+    """
+    persons = [
+        {"id": f"P{index}", "name": f"Person {index}"} for index in range(person_count)
+    ]
+    assertions = []
+    for index in range(assertion_count):
+        assertion: dict[str, Any] = {
+            "id": f"A{index}",
+            "subject": f"P{index % person_count}",
+            "object": f"P{(index + 2) % person_count}",
+            "predicate": "knows",
+        }
+        if layers:
+            layer = layers[index % len(layers)]
+            assertion["extensions"] = {"psellos": {"layer": layer}}
+        assertions.append(assertion)
+    return {"persons": persons, "assertions": assertions}
+
+
+def manifest_for(dataset: dict) -> dict:
+    """Build the manifest of a test dataset with placeholder spec and input paths."""
+    return build_manifest(
+        dataset, spec_path=Path("schema.json"), input_path=Path("data.json")
+    )
+
+
+def write_dataset(dist_path: Path, dataset: dict, **options: Any) -> None:
+    """Build ``dataset`` into ``dist_path``; ``options`` go to ``write_dist``."""
+    write_dist(
+        dist_path=dist_path,
+        manifest=manifest_for(dataset),
+        dataset=dataset,
+        **options,
+    )
@@ -0,0 +1,188 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.builders import compile as compile_module
+from psellos_builder.builders import layer_stats
+from psellos_builder.builders.compile import compile_dataset
+from psellos_builder.exporters import artifacts
+from psellos_builder.exporters.artifacts import ArtifactWriter, BackgroundArtifactWriter
+from psellos_builder.validators.compiler import SCHEMA_CACHE_ENV
+
+from helpers import make_dataset
+
+SCHEMA = {
+    "type": "object",
+    "required": ["persons", "assertions"],
+    "properties": {
+        "persons": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "name"],
+                "properties": {"id": {"type": "string"}, "name": {"type": "string"}},
+            },
+        },
+        "assertions": {"type": "array", "items": {"type": "object"}},
+    },
+}
+
+
+def _files(root: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class PipelinedCompileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        self.spec_path = self.root / "schema.json"
+        self.spec_path.write_text(json.dumps(SCHEMA), encoding="utf-8")
+        patcher = mock.patch.dict(
+            os.environ, {SCHEMA_CACHE_ENV: str(self.root / "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _input(self, dataset: dict) -> Path:
+        path = self.root / "data.json"
+        path.write_text(json.dumps(dataset), encoding="utf-8")
+        return path
+
+    def test_matches_sequential_build(self) -> None:
+        input_path = self._input(make_dataset(5, 12))
+        options = {"page_size": 4, "person_cards": True, "content_addressed": True}
+        compile_dataset(
+            spec_path=self.spec_path,
+            input_path=input_path,
+            dist_path=self.root / "sequential",
+            **options,
+        )
+        compile_dataset(
+            spec_path=self.spec_path,
+            input_path=input_path,
+            dist_path=self.root / "pipelined",
+            pipelined=True,
+            **options,
+        )
+        self.assertEqual(
+            _files(self.root / "sequential"), _files(self.root / "pipelined")
+        )
+        self.assertFalse((self.root / ".pipelined.staging").exists())
+
+    def test_process_pools_are_not_forked_from_threaded_builds(self) -> None:
+        dataset = make_dataset(5, 12)
+        shards = self.root / "shards"
+        shards.mkdir()
+        for index, start in enumerate(range(0, 12, 4)):
+            (shards / f"{index}.json").write_text(
+                json.dumps(
+                    {
+                        "persons": dataset["persons"] if index == 0 else [],
+                        "assertions": dataset["assertions"][start : start + 4],
+                    }
+                ),
+                encoding="utf-8",
+            )
+        compile_dataset(
+            spec_path=self.spec_path,
+            input_path=shards,
+            dist_path=self.root / "sequential",
+            workers=1,
+        )
+        # Forking while the executor and writer threads run warns on Python
+        # 3.12+ and can deadlock; pools must use forkserver or spawn instead.
+        with (
+            warnings.catch_warnings(),
+            mock.patch.object(layer_stats, "PARALLEL_STATS_MIN_ASSERTIONS", 0),
+            mock.patch.object(os, "fork", side_effect=AssertionError("forked")),
+        ):
+            warnings.simplefilter("error", DeprecationWarning)
+            compile_dataset(
+                spec_path=self.spec_path,
+                input_path=shards,
+                dist_path=self.root / "pipelined",
+                workers=2,
+                pipelined=True,
+            )
+        self.assertEqual(
+            _files(self.root / "sequential"), _files(self.root / "pipelined")
+        )
+
+    def test_invalid_dataset_leaves_dist_untouched(self) -> None:
+        dataset = make_dataset(5, 12)
+        dataset["persons"][3]["name"] = 7
+        input_path = self._input(dataset)
+        dist_path = self.root / "dist"
+        dist_path.mkdir()
+        (dist_path / "manifest.json").write_text("{}\n", encoding="utf-8")
+
+        with self.assertRaisesRegex(ValueError, "Schema validation error at persons/3"):
+            compile_dataset(
+                spec_path=self.spec_path,
+                input_path=input_path,
+                dist_path=dist_path,
+                pipelined=True,
+            )
+        self.assertEqual({"manifest.json": b"{}\n"}, _files(dist_path))
+        self.assertFalse((self.root / ".dist.staging").exists())
+
+    def test_validation_process_loads_with_one_worker(self) -> None:
+        input_path = self._input(make_dataset(5, 12))
+        with mock.patch.object(compile_module, "validate_schema") as validate:
+            compile_module._validate_input(self.spec_path, input_path)
+        validate.assert_called_once_with(
+            spec_path=self.spec_path, input_path=input_path, workers=1
+        )
+
+
+class ContentAddressedCopyTests(unittest.TestCase):
+    def test_interrupted_copy_leaves_no_hashed_file(self) -> None:
+        def partial_copy(source, target):
+            Path(target).write_bytes(Path(source).read_bytes()[:3])
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            writer = ArtifactWriter(root)
+            writer.write_json("persons.json", {"P1": {"id": "P1"}})
+            with mock.patch.object(artifacts.shutil, "copyfile", partial_copy):
+                with self.assertRaises(KeyboardInterrupt):
+                    writer.write_content_addressed(exclude=frozenset())
+            self.assertEqual(["persons.json"], [path.name for path in root.iterdir()])
+
+            [(logical, hashed)] = writer.write_content_addressed(
+                exclude=frozenset()
+            ).items()
+            self.assertEqual(
+                (root / logical).read_bytes(), (root / hashed).read_bytes()
+            )
+
+
+class BackgroundArtifactWriterTests(unittest.TestCase):
+    def test_write_errors_surface_on_close(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "taken").write_text("", encoding="utf-8")
+            writer = BackgroundArtifactWriter(root, queue_size=1)
+            writer.write_json("ok.json", {"a": 1})
+            writer.write_bytes("taken/child.json", b"{}")
+            with self.assertRaises(OSError):
+                writer.close()
+            self.assertEqual(b'{\n  "a": 1\n}\n', (root / "ok.json").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
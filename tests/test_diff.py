@@ -0,0 +1,104 @@
+import copy
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.diff import diff_dists, iter_object_items
+
+from helpers import make_dataset, write_dataset
+
+
+class ObjectStreamTests(unittest.TestCase):
+    def test_matches_json_load_across_chunk_boundaries(self) -> None:
+        payload = {
+            "a": [1, 2.5, -30, {"nested": "ψε"}],
+            "b": 12345678901234567890,
+            "c": {},
+            "d": "quote \" and \\ backslash",
+            "e": None,
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "payload.json"
+            for text in (json.dumps(payload, indent=2), json.dumps(payload), "{ }"):
+                path.write_text(text, encoding="utf-8")
+                with self.subTest(text=text[:20]), mock.patch(
+                    "psellos_builder.diff.READ_CHUNK_SIZE", 3
+                ):
+                    self.assertEqual(json.loads(text), dict(iter_object_items(path)))
+
+
+class DiffTests(unittest.TestCase):
+    def test_reports_record_and_layer_changes(self) -> None:
+        old = make_dataset(5, 6, layers=("canon", "alt"))
+        new = copy.deepcopy(old)
+        new["persons"].pop(0)
+        new["persons"].append({"id": "P9", "name": "Person 9"})
+        new["persons"][0]["name"] = "Renamed"
+        new["assertions"] = [a for a in new["assertions"] if a["id"] != "A0"]
+        new["assertions"].append(
+            {"id": "A9", "subject": "P1", "object": "P9", "predicate": "knows"}
+        )
+        moved = next(a for a in new["assertions"] if a["id"] == "A1")
+        moved["extensions"]["psellos"]["layer"] = "canon"
+        edited = next(a for a in new["assertions"] if a["id"] == "A2")
+        edited["predicate"] = "teaches"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_dist = Path(temp_dir) / "old"
+            new_dist = Path(temp_dir) / "new"
+            write_dataset(old_dist, old)
+            write_dataset(new_dist, new)
+            changeset = diff_dists(old_dist=old_dist, new_dist=new_dist)
+
+        self.assertEqual(
+            {"added": ["P9"], "removed": ["P0"], "changed": ["P1"]},
+            changeset["persons"],
+        )
+        self.assertEqual(
+            {"added": ["A9"], "removed": ["A0"], "changed": ["A1", "A2"]},
+            changeset["assertions"],
+        )
+        canon = changeset["layers"]["canon"]
+        self.assertEqual(2, canon["added_count"])
+        self.assertEqual(1, canon["removed_count"])
+        self.assertEqual(1, canon["changed_count"])
+        self.assertEqual({"(none)": 2}, canon["added_rel_count_by_type"])
+        alt = changeset["layers"]["alt"]
+        self.assertEqual(1, alt["removed_count"])
+        self.assertEqual(
+            [{"personId": "P1", "count": 1}, {"personId": "P3", "count": 1}],
+            alt["removed_persons_topN"],
+        )
+
+    def test_lean_builds_compare_detail_fields(self) -> None:
+        old = make_dataset(5, 6, layers=("canon", "alt"))
+        for assertion in old["assertions"]:
+            assertion["source"] = {"citation": f"Chronographia {assertion['id']}"}
+        new = copy.deepcopy(old)
+        new["assertions"][3]["source"]["citation"] = "Alexiad"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_dist = Path(temp_dir) / "old"
+            lean_dist = Path(temp_dir) / "lean"
+            full_dist = Path(temp_dir) / "full"
+            write_dataset(old_dist, old, projection="lean")
+            write_dataset(lean_dist, new, projection="lean")
+            write_dataset(full_dist, new)
+            lean = diff_dists(old_dist=old_dist, new_dist=lean_dist)
+            mixed = diff_dists(old_dist=old_dist, new_dist=full_dist)
+
+        for changeset in (lean, mixed):
+            self.assertEqual(
+                {"added": [], "removed": [], "changed": ["A3"]},
+                changeset["assertions"],
+            )
+            self.assertEqual(1, changeset["layers"]["alt"]["changed_count"])
+
+
+if __name__ == "__main__":
+    unittest.main()
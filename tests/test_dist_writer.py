@@ -0,0 +1,358 @@
+import hashlib
+import json
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.builders import external_index
+from psellos_builder.exporters.dist_writer import write_dist
+
+from helpers import write_dataset
+
+
+def _dataset() -> dict:
+    persons = [{"id": f"P{index}", "name": f"Person {index}"} for index in range(4)]
+    assertions = []
+    for index in range(7):
+        assertion = {
+            "id": f"A{index:02d}",
+            "subject": {"id": f"P{index % 4}"},
+            "object": f"P{(index + 1) % 4}",
+            "predicate": "parent_of",
+        }
+        if index % 3 == 0:
+            assertion["extensions"] = {"psellos": {"layer": "alt", "rel": "kin"}}
+        assertions.append(assertion)
+    assertions.reverse()
+    return {"persons": persons, "assertions": assertions}
+
+
+def _load(path: Path):
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+class PaginationTests(unittest.TestCase):
+    def test_pages_cover_sorted_assertions(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir)
+            write_dataset(dist_path, _dataset(), page_size=3)
+
+            directory = _load(dist_path / "assertions" / "index.json")
+            self.assertEqual(3, directory["page_count"])
+            self.assertEqual(7, directory["total_count"])
+            ids = []
+            for page in directory["pages"]:
+                page_path = dist_path / page["path"]
+                self.assertEqual(page["bytes"], page_path.stat().st_size)
+                records = _load(page_path)
+                self.assertEqual(page["first_id"], records[0]["id"])
+                self.assertEqual(page["last_id"], records[-1]["id"])
+                ids.extend(record["id"] for record in records)
+            self.assertEqual([f"A{index:02d}" for index in range(7)], ids)
+
+            layers = _load(dist_path / "assertions_by_layer" / "index.json")
+            self.assertEqual(["alt", "canon"], sorted(layers["layers"]))
+            alt = _load(dist_path / layers["layers"]["alt"]["directory"])
+            self.assertEqual(3, alt["total_count"])
+            self.assertEqual("A00", alt["pages"][0]["first_id"])
+
+    def test_layer_directories_do_not_collide_with_escaped_ids(self) -> None:
+        dataset = _dataset()
+        for assertion, layer in zip(dataset["assertions"], ("a b", "x-612062")):
+            assertion["extensions"] = {"psellos": {"layer": layer}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir)
+            write_dataset(dist_path, dataset, page_size=3)
+
+            layers = _load(dist_path / "assertions_by_layer" / "index.json")["layers"]
+            self.assertEqual(
+                "assertions_by_layer/x-612062/index.json", layers["a b"]["directory"]
+            )
+            self.assertEqual(
+                "assertions_by_layer/x-782d363132303632/index.json",
+                layers["x-612062"]["directory"],
+            )
+            for layer in ("a b", "x-612062"):
+                directory = _load(dist_path / layers[layer]["directory"])
+                self.assertEqual(1, directory["total_count"])
+
+
+class NdjsonOutputTests(unittest.TestCase):
+    def test_ndjson_matches_json_artifacts(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir)
+            write_dataset(dist_path, _dataset(), ndjson=True)
+
+            with (dist_path / "assertions.ndjson").open(encoding="utf-8") as handle:
+                assertions = [json.loads(line) for line in handle]
+            with (dist_path / "persons.ndjson").open(encoding="utf-8") as handle:
+                persons = [json.loads(line) for line in handle]
+
+            self.assertEqual(_load(dist_path / "assertions.json"), assertions)
+            self.assertEqual(list(_load(dist_path / "persons.json").values()), persons)
+
+
+class ContentAddressedTests(unittest.TestCase):
+    def test_unchanged_artifacts_keep_their_hashed_names(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir)
+            dataset = _dataset()
+            write_dataset(dist_path, dataset, content_addressed=True)
+            first = _load(dist_path / "manifest.json")["artifacts"]
+
+            dataset["assertions"][0]["predicate"] = "spouse_of"
+            write_dataset(dist_path, dataset, content_addressed=True)
+            second = _load(dist_path / "manifest.json")["artifacts"]
+
+            self.assertNotIn("manifest.json", first)
+            self.assertEqual(first["persons.json"], second["persons.json"])
+            self.assertNotEqual(first["assertions.json"], second["assertions.json"])
+            for logical, hashed in second.items():
+                self.assertEqual(
+                    (dist_path / logical).read_bytes(),
+                    (dist_path / hashed).read_bytes(),
+                )
+
+
+class ExternalIndexTests(unittest.TestCase):
+    def test_spilled_runs_match_in_memory_output(self) -> None:
+        dataset = _dataset()
+        dataset["persons"].append({"id": "Ψ1", "name": "Ψελλός"})
+        dataset["assertions"].append(dict(dataset["assertions"][0]))
+        dataset["assertions"].append(
+            {"id": "A99", "subject": "Ψ1", "object": "P0", "predicate": "knows"}
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            memory_path = Path(temp_dir) / "memory"
+            external_path = Path(temp_dir) / "external"
+            write_dataset(memory_path, dataset)
+            write_dataset(external_path, dataset, index_memory_budget=1)
+
+            names = sorted(path.name for path in memory_path.iterdir())
+            self.assertEqual(
+                names, sorted(path.name for path in external_path.iterdir())
+            )
+            for name in names:
+                with self.subTest(artifact=name):
+                    self.assertEqual(
+                        (memory_path / name).read_bytes(),
+                        (external_path / name).read_bytes(),
+                    )
+
+    def test_many_runs_merge_with_bounded_fan_in(self) -> None:
+        dataset = _dataset()
+        dataset["assertions"].extend(
+            {"id": f"B{index:03d}", "subject": f"P{index % 4}", "object": "P0"}
+            for index in range(60)
+        )
+        open_runs = 0
+        peak_open_runs = 0
+        read_run = external_index._read_run
+
+        def tracked_read_run(path: Path):
+            nonlocal open_runs, peak_open_runs
+            open_runs += 1
+            peak_open_runs = max(peak_open_runs, open_runs)
+            try:
+                yield from read_run(path)
+            finally:
+                open_runs -= 1
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            memory_path = Path(temp_dir) / "memory"
+            external_path = Path(temp_dir) / "external"
+            write_dataset(memory_path, dataset)
+            with (
+                mock.patch.object(external_index, "MAX_MERGE_FAN_IN", 4),
+                mock.patch.object(external_index, "_read_run", tracked_read_run),
+            ):
+                write_dataset(external_path, dataset, index_memory_budget=1)
+
+            self.assertLessEqual(peak_open_runs, 4)
+            for name in (
+                "assertions_by_person.json",
+                "assertions_by_person_by_layer.json",
+            ):
+                self.assertEqual(
+                    (memory_path / name).read_bytes(),
+                    (external_path / name).read_bytes(),
+                )
+
+
+class PersonCardTests(unittest.TestCase):
+    def test_cards_summarize_each_person_in_hashed_shards(self) -> None:
+        dataset = _dataset()
+        dataset["persons"].append({"id": "P9", "label": "Loner"})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir) / "memory"
+            external_path = Path(temp_dir) / "external"
+            write_dataset(dist_path, dataset, person_cards=True)
+            write_dataset(
+                external_path, dataset, person_cards=True, index_memory_budget=1
+            )
+
+            directory = _load(dist_path / "person_cards" / "index.json")
+            cards = {}
+            for key in directory["shards"]:
+                shard_path = dist_path / "person_cards" / f"{key}.json"
+                self.assertEqual(
+                    shard_path.read_bytes(),
+                    (external_path / "person_cards" / f"{key}.json").read_bytes(),
+                )
+                for person_id, card in _load(shard_path).items():
+                    self.assertEqual(
+                        key, hashlib.sha1(person_id.encode("utf-8")).hexdigest()[:2]
+                    )
+                    cards[person_id] = card
+
+        self.assertEqual({"P0", "P1", "P2", "P3", "P9"}, set(cards))
+        self.assertEqual(
+            {
+                "display_name": "Person 0",
+                "assertion_count": 3,
+                "layers": ["alt", "canon"],
+                "assertion_count_by_layer": {"alt": 2, "canon": 1},
+                "rel_count_by_type": {"(none)": 1, "kin": 2},
+                "top_co_occurring": [
+                    {"personId": "P1", "count": 2},
+                    {"personId": "P3", "count": 1},
+                ],
+            },
+            cards["P0"],
+        )
+        self.assertEqual(0, cards["P9"]["assertion_count"])
+        self.assertEqual("Loner", cards["P9"]["display_name"])
+
+
+class ProjectionTests(unittest.TestCase):
+    def test_lean_core_and_details_restore_full_assertions(self) -> None:
+        dataset = _dataset()
+        for assertion in dataset["assertions"]:
+            assertion["source"] = {"citation": f"Chronographia {assertion['id']}"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            full_path = Path(temp_dir) / "full"
+            lean_path = Path(temp_dir) / "lean"
+            write_dataset(full_path, dataset, page_size=3)
+            write_dataset(lean_path, dataset, page_size=3, projection="lean")
+
+            for name in ("layer_stats.json", "assertions_by_layer.json", "layers.json"):
+                self.assertEqual(
+                    (full_path / name).read_bytes(), (lean_path / name).read_bytes()
+                )
+            self.assertEqual("lean", _load(lean_path / "manifest.json")["projection"])
+
+            core = _load(lean_path / "assertions_by_id.json")
+            directory = _load(lean_path / "assertion_details" / "index.json")
+            details = {}
+            for key in directory["shards"]:
+                details.update(_load(lean_path / "assertion_details" / f"{key}.json"))
+            full = _load(full_path / "assertions_by_id.json")
+            self.assertEqual(sorted(full), sorted(details))
+            for assertion_id, assertion in full.items():
+                restored = {**core[assertion_id], **details[assertion_id]}
+                self.assertEqual(assertion, restored)
+
+            self.assertEqual(
+                {
+                    "id": "A00",
+                    "subject": "P0",
+                    "object": "P1",
+                    "predicate": "parent_of",
+                    "extensions": {"psellos": {"layer": "alt", "rel": "kin"}},
+                },
+                core["A00"],
+            )
+            self.assertEqual(
+                sorted(core.values(), key=lambda record: record["id"]),
+                sorted(
+                    _load(lean_path / "assertions.json"),
+                    key=lambda record: record["id"],
+                ),
+            )
+            page = _load(lean_path / "assertions" / "page-0001.json")
+            self.assertNotIn("source", page[0])
+
+
+class IntegrityReportTests(unittest.TestCase):
+    def test_reports_duplicates_dangling_endpoints_and_unknown_layers(self) -> None:
+        dataset = _dataset()
+        dataset["assertions"].append(dict(dataset["assertions"][0]))
+        dataset["assertions"].append(
+            {"id": "A99", "subject": "P0", "object": "P404", "predicate": "knows"}
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "layers_meta.source.json").write_text(
+                json.dumps({"layers": [{"id": "canon"}]}), encoding="utf-8"
+            )
+            for budget in (None, 1):
+                dist_path = root / f"dist-{budget}"
+                with self.assertWarnsRegex(UserWarning, "integrity_report.json"):
+                    write_dataset(
+                        dist_path,
+                        dataset,
+                        input_path=root / "data.json",
+                        index_memory_budget=budget,
+                    )
+                report = _load(dist_path / "integrity_report.json")
+                self.assertEqual(8, report["assertion_count"])
+                self.assertTrue(report["layers_meta_checked"])
+                self.assertEqual(
+                    {"count": 1, "samples": ["A06"], "sources": {}},
+                    report["duplicate_assertion_ids"],
+                )
+                dangling = {
+                    "assertion_id": "A99",
+                    "role": "object",
+                    "person_id": "P404",
+                }
+                self.assertEqual(
+                    {"count": 1, "samples": [dangling]}, report["dangling_endpoints"]
+                )
+                self.assertEqual(
+                    {"count": 1, "assertion_count": 4, "samples": ["alt"]},
+                    report["unknown_layers"],
+                )
+
+    def test_unknown_layers_count_layer_ids_not_records(self) -> None:
+        dataset = _dataset()
+        for assertion in dataset["assertions"]:
+            assertion["extensions"] = {"psellos": {"layer": "x y"}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "layers_meta.source.json").write_text(
+                json.dumps({"layers": [{"id": "canon"}]}), encoding="utf-8"
+            )
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                write_dataset(root / "dist", dataset, input_path=root / "data.json")
+            report = _load(root / "dist" / "integrity_report.json")
+
+        self.assertEqual(
+            {"count": 1, "assertion_count": 7, "samples": ["x y"]},
+            report["unknown_layers"],
+        )
+        [message] = [
+            str(warning.message)
+            for warning in caught
+            if "integrity_report.json" in str(warning.message)
+        ]
+        self.assertIn("1 unknown layers", message)
+        self.assertNotIn("7 unknown layers", message)
+
+    def test_duplicate_person_ids_still_fail(self) -> None:
+        dataset = _dataset()
+        dataset["persons"].append({"id": "P0", "name": "Again"})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaisesRegex(ValueError, "Duplicate person id"):
+                write_dist(dist_path=Path(temp_dir), manifest={}, dataset=dataset)
+
+
+if __name__ == "__main__":
+    unittest.main()
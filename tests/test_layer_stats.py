@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.builders.layer_stats import (
+    _build_layer_stats,
+    _build_layer_stats_parallel,
+    count_persons_by_layer,
+)
+from psellos_builder.exporters.artifacts import encode_json
+from psellos_builder.exporters.dist_writer import _build_assertion_indexes
+from psellos_builder.layers import build_layer_indexes
+
+
+def _assertions() -> list[dict]:
+    layers = ["canon", "alt", "editorial", "canon", "x y"]
+    rels = ["kin", "office", None]
+    assertions = []
+    for index in range(300):
+        assertion = {
+            "id": f"A{index:04d}",
+            "subject": f"P{index % 17}",
+            "predicate": "knows",
+        }
+        if index % 11:
+            assertion["object"] = f"P{(index * 7) % 23}"
+        psellos = {"layer": layers[index % len(layers)]}
+        if rels[index % len(rels)] is not None:
+            psellos["rel"] = rels[index % len(rels)]
+        assertion["extensions"] = {"psellos": psellos}
+        assertions.append(assertion)
+    # Shared ids across layers exercise compare_to_canon overlaps.
+    for index in range(0, 300, 13):
+        assertions.append(
+            {
+                "id": f"A{index:04d}",
+                "subject": "P0",
+                "object": "P0",
+                "extensions": {"psellos": {"layer": "alt"}},
+            }
+        )
+    return assertions
+
+
+class ParallelLayerStatsTests(unittest.TestCase):
+    def test_parallel_output_is_byte_identical(self) -> None:
+        assertions = _assertions()
+        _, assertions_by_id = _build_assertion_indexes(assertions)
+        assertions_by_layer, by_person_by_layer = build_layer_indexes(assertions)
+        options = {
+            "assertions_by_layer": assertions_by_layer,
+            "person_counts_by_layer": count_persons_by_layer(by_person_by_layer),
+            "assertions_by_id": assertions_by_id,
+        }
+
+        sequential = _build_layer_stats(**options)
+        parallel = _build_layer_stats_parallel(**options, workers=2)
+
+        self.assertTrue(sequential["compare_to_canon"])
+        self.assertEqual(encode_json(sequential), encode_json(parallel))
+
+
+if __name__ == "__main__":
+    unittest.main()
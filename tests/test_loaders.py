@@ -0,0 +1,111 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.loaders import dataset_root, load_ndjson, resolve_dataset_files
+from psellos_builder.validators.schema import load_dataset
+
+from helpers import write_dataset
+
+
+def _write(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+
+
+class DatasetShardTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        _write(
+            self.root / "a.json",
+            {"persons": [{"id": "P1", "name": "A"}], "assertions": [{"id": "A1"}]},
+        )
+        _write(
+            self.root / "nested" / "b.json",
+            {"persons": [{"id": "P2", "name": "B"}], "assertions": [{"id": "A2"}]},
+        )
+        _write(self.root / "layers_meta.source.json", {"layers": []})
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_directory_shards_are_merged_in_path_order(self) -> None:
+        dataset = load_dataset(self.root, workers=2)
+
+        self.assertEqual(["P1", "P2"], [person["id"] for person in dataset["persons"]])
+        self.assertEqual(["A1", "A2"], [entry["id"] for entry in dataset["assertions"]])
+
+    def test_glob_input_keeps_sidecar_discovery(self) -> None:
+        pattern = self.root / "*.json"
+
+        self.assertEqual([self.root / "a.json"], resolve_dataset_files(pattern))
+        self.assertEqual(self.root, dataset_root(pattern))
+
+    def test_duplicate_ids_report_conflicting_files(self) -> None:
+        _write(
+            self.root / "c.json",
+            {"persons": [{"id": "P1", "name": "A again"}], "assertions": []},
+        )
+
+        with self.assertRaises(ValueError) as context:
+            load_dataset(self.root, workers=1)
+
+        message = str(context.exception)
+        self.assertIn("person id 'P1'", message)
+        self.assertIn("a.json", message)
+        self.assertIn("c.json", message)
+
+    def test_duplicate_assertion_ids_are_reported_with_their_shards(self) -> None:
+        _write(
+            self.root / "c.json",
+            {"persons": [], "assertions": [{"id": "A1"}, {"id": "A1"}]},
+        )
+
+        dataset = load_dataset(self.root, workers=1)
+        self.assertEqual(
+            ["A1", "A1", "A1", "A2"], [entry["id"] for entry in dataset["assertions"]]
+        )
+
+        dist_path = self.root / "dist"
+        with self.assertWarnsRegex(UserWarning, "2 duplicate assertion ids"):
+            write_dataset(dist_path, dataset, input_path=self.root)
+        with (dist_path / "integrity_report.json").open(encoding="utf-8") as handle:
+            duplicates = json.load(handle)["duplicate_assertion_ids"]
+
+        shards = [(self.root / name).as_posix() for name in ("a.json", "c.json")]
+        self.assertEqual(
+            {"A1": [shards[0], shards[1], shards[1]]}, duplicates["sources"]
+        )
+
+
+class NdjsonInputTests(unittest.TestCase):
+    def test_records_are_routed_by_kind(self) -> None:
+        lines = [
+            {"kind": "assertion", "record": {"id": "A1"}},
+            {"kind": "person", "record": {"id": "P1", "name": "A"}},
+        ]
+        handle = io.StringIO("\n".join(json.dumps(line) for line in lines) + "\n\n")
+
+        dataset = load_ndjson(handle, "<test>")
+
+        self.assertEqual([{"id": "P1", "name": "A"}], dataset["persons"])
+        self.assertEqual([{"id": "A1"}], dataset["assertions"])
+
+    def test_unknown_kind_reports_line(self) -> None:
+        handle = io.StringIO('{"kind": "place", "record": {}}\n')
+
+        with self.assertRaises(ValueError) as context:
+            load_ndjson(handle, "<test>")
+
+        self.assertIn("line 1", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.exporters.publish import (
+    LocalDirectoryBackend,
+    publish_dist,
+    publish_order,
+)
+
+from helpers import make_dataset, write_dataset
+
+
+class _RecordingBackend(LocalDirectoryBackend):
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.uploads: list[str] = []
+
+    def upload(self, key: str, source: Path) -> None:
+        super().upload(key, source)
+        self.uploads.append(key)
+
+
+def _write(dist_path: Path, predicate: str) -> None:
+    dataset = make_dataset(3, 2)
+    dataset["assertions"][0]["predicate"] = predicate
+    write_dataset(dist_path, dataset, page_size=1, person_cards=True)
+
+
+class PublishTests(unittest.TestCase):
+    def test_nested_directories_publish_before_their_parents(self) -> None:
+        stages = publish_order(
+            [
+                "manifest.json",
+                "assertions_by_layer/index.json",
+                "assertions_by_layer/canon/index.json",
+                "assertions_by_layer/canon/page-0001.json",
+                "persons.json",
+            ]
+        )
+        self.assertEqual(
+            [
+                ["assertions_by_layer/canon/page-0001.json", "persons.json"],
+                ["assertions_by_layer/canon/index.json"],
+                ["assertions_by_layer/index.json"],
+                ["manifest.json"],
+            ],
+            stages,
+        )
+
+    def test_uploads_changed_files_with_manifest_last(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir) / "dist"
+            target = Path(temp_dir) / "remote"
+            _write(dist_path, "parent_of")
+            files = sorted(
+                path.relative_to(dist_path).as_posix()
+                for path in dist_path.rglob("*")
+                if path.is_file()
+            )
+
+            backend = _RecordingBackend(target)
+            report = publish_dist(dist_path=dist_path, backend=backend, concurrency=4)
+            self.assertEqual(len(files), report["uploaded"])
+            self.assertEqual(0, report["skipped"])
+            self.assertEqual(files, sorted(backend.uploads))
+            self.assertEqual("manifest.json", backend.uploads[-1])
+            self.assertLess(
+                backend.uploads.index("assertions/page-0001.json"),
+                backend.uploads.index("assertions/index.json"),
+            )
+            self.assertLess(
+                backend.uploads.index("assertions_by_layer/canon/index.json"),
+                backend.uploads.index("assertions_by_layer/index.json"),
+            )
+            for name in files:
+                self.assertEqual(
+                    (dist_path / name).read_bytes(), (target / name).read_bytes()
+                )
+
+            backend = _RecordingBackend(target)
+            report = publish_dist(dist_path=dist_path, backend=backend)
+            self.assertEqual([], backend.uploads)
+            self.assertEqual((0, len(files)), (report["uploaded"], report["skipped"]))
+
+            _write(dist_path, "spouse_of")
+            backend = _RecordingBackend(target)
+            publish_dist(dist_path=dist_path, backend=backend)
+            self.assertIn("assertions.json", backend.uploads)
+            self.assertNotIn("persons.json", backend.uploads)
+            self.assertEqual(
+                (dist_path / "assertions.json").read_bytes(),
+                (target / "assertions.json").read_bytes(),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
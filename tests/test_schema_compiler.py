@@ -0,0 +1,237 @@
+import copy
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.validators.bundle import bundle_path, load_schema_bundle
+from psellos_builder.validators.compiler import (
+    UnsupportedSchemaError,
+    load_compiled_validator,
+)
+from psellos_builder.validators.schema import load_referenced_schema
+
+HAS_JSONSCHEMA = importlib.util.find_spec("jsonschema") is not None
+
+CORE_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": "https://psellos.org/spec/schema/core.test.v0.1.json",
+    "$defs": {
+        "id": {"type": "string", "minLength": 1, "pattern": "^[A-Za-z0-9_-]+$"},
+        "endpoint": {
+            "anyOf": [
+                {"$ref": "#/$defs/id"},
+                {
+                    "type": "object",
+                    "required": ["id"],
+                    "properties": {"id": {"$ref": "#/$defs/id"}},
+                },
+            ]
+        },
+        "person": {
+            "type": "object",
+            "required": ["id", "entity_type"],
+            "properties": {
+                "id": {"$ref": "#/$defs/id"},
+                "entity_type": {"const": "person"},
+                "label": {"type": "string"},
+                "names": {
+                    "type": "array",
+                    "items": {
+                        "oneOf": [
+                            {"type": "string"},
+                            {
+                                "type": "object",
+                                "required": ["value"],
+                                "properties": {"value": {"type": "string"}},
+                            },
+                        ]
+                    },
+                    "uniqueItems": True,
+                },
+                "born": {"type": "integer", "minimum": 0, "maximum": 2000},
+            },
+            "additionalProperties": False,
+        },
+        "assertion": {
+            "type": "object",
+            "required": ["id", "subject", "predicate", "object"],
+            "properties": {
+                "id": {"$ref": "#/$defs/id"},
+                "subject": {"$ref": "#/$defs/endpoint"},
+                "object": {"$ref": "#/$defs/endpoint"},
+                "predicate": {"enum": ["parent_of", "spouse_of", "sibling_of"]},
+                "confidence": {"type": "number", "exclusiveMaximum": 1},
+                "extensions": {
+                    "type": "object",
+                    "patternProperties": {"^[a-z]+$": {"type": "object"}},
+                    "additionalProperties": False,
+                },
+            },
+            "if": {"properties": {"predicate": {"const": "spouse_of"}}},
+            "then": {"required": ["date"]},
+        },
+    },
+}
+
+ROOT_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": "https://psellos.org/spec/schema/root.test.v0.1.json",
+    "type": "object",
+    "required": ["persons", "assertions"],
+    "properties": {
+        "persons": {
+            "type": "array",
+            "items": {"$ref": "core.test.v0.1.json#/$defs/person"},
+        },
+        "assertions": {
+            "type": "array",
+            "items": {"$ref": "core.test.v0.1.json#/$defs/assertion"},
+            "minItems": 1,
+        },
+    },
+}
+
+VALID = {
+    "persons": [
+        {"id": "P1", "entity_type": "person", "names": ["Anna", {"value": "Ἄννα"}]},
+        {"id": "P2", "entity_type": "person", "label": "Eirene", "born": 1066},
+    ],
+    "assertions": [
+        {
+            "id": "A1",
+            "subject": {"id": "P2"},
+            "predicate": "parent_of",
+            "object": "P1",
+            "confidence": 0.5,
+            "extensions": {"psellos": {"layer": "canon"}},
+        }
+    ],
+}
+
+
+def _mutations() -> list:
+    cases = [VALID]
+    edits = [
+        lambda d: d.pop("assertions"),
+        lambda d: d.update(persons={}),
+        lambda d: d["persons"][0].pop("entity_type"),
+        lambda d: d["persons"][0].update(entity_type="place"),
+        lambda d: d["persons"][0].update(id=""),
+        lambda d: d["persons"][0].update(id="bad id"),
+        lambda d: d["persons"][0].update(extra=1),
+        lambda d: d["persons"][0].update(names=["Anna", "Anna"]),
+        lambda d: d["persons"][0].update(names=[3]),
+        lambda d: d["persons"][1].update(born=1066.0),
+        lambda d: d["persons"][1].update(born=True),
+        lambda d: d["persons"][1].update(born=-1),
+        lambda d: d["assertions"][0].update(subject={"name": "P2"}),
+        lambda d: d["assertions"][0].update(object=7),
+        lambda d: d["assertions"][0].update(predicate="knows"),
+        lambda d: d["assertions"][0].update(predicate="spouse_of"),
+        lambda d: d["assertions"][0].update(confidence=1),
+        lambda d: d["assertions"][0].update(extensions={"Psellos": {}}),
+        lambda d: d["assertions"][0].update(extensions={"psellos": []}),
+        lambda d: d.update(assertions=[]),
+    ]
+    for edit in edits:
+        mutated = copy.deepcopy(VALID)
+        edit(mutated)
+        cases.append(mutated)
+    return cases
+
+
+class SchemaCompilerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.schema_dir = Path(self._temp_dir.name)
+        with (self.schema_dir / "core.test.v0.1.json").open("w", encoding="utf-8") as handle:
+            json.dump(CORE_SCHEMA, handle)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _compile(self, schema: dict):
+        return load_compiled_validator(
+            schema,
+            retrieve=lambda uri: load_referenced_schema(uri, self.schema_dir),
+            cache_dir=self.schema_dir / "cache",
+        )
+
+    @unittest.skipUnless(HAS_JSONSCHEMA, "jsonschema is not installed")
+    def test_matches_draft202012_first_error(self) -> None:
+        from jsonschema import Draft202012Validator
+        from referencing import Registry, Resource
+
+        registry = Registry(
+            retrieve=lambda uri: Resource.from_contents(
+                load_referenced_schema(uri, self.schema_dir)
+            )
+        )
+        reference = Draft202012Validator(ROOT_SCHEMA, registry=registry)
+        compiled = self._compile(ROOT_SCHEMA)
+
+        for instance in _mutations():
+            expected_error = next(reference.iter_errors(instance), None)
+            expected = (
+                None
+                if expected_error is None
+                else (list(expected_error.path), expected_error.message)
+            )
+            with self.subTest(instance=instance):
+                self.assertEqual(expected, compiled(instance))
+
+    def test_generated_validator_is_cached_by_digest(self) -> None:
+        self._compile(ROOT_SCHEMA)
+        cached = list((self.schema_dir / "cache").glob("validator_*.py"))
+        self.assertEqual(1, len(cached))
+
+    def test_unsupported_keywords_are_rejected(self) -> None:
+        with self.assertRaises(UnsupportedSchemaError):
+            self._compile({"type": "object", "unevaluatedProperties": False})
+
+
+class SchemaBundleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.schema_dir = Path(self._temp_dir.name)
+        self.core_path = self.schema_dir / "core.test.v0.1.json"
+        self.spec_path = self.schema_dir / "schema.json"
+        self.cache_dir = self.schema_dir / "cache"
+        self.core_path.write_text(json.dumps(CORE_SCHEMA), encoding="utf-8")
+        self.spec_path.write_text(json.dumps(ROOT_SCHEMA), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_fresh_bundle_serves_references_without_reading_them(self) -> None:
+        first = load_schema_bundle(self.spec_path, cache_dir=self.cache_dir)
+        self.assertTrue(bundle_path(self.spec_path, cache_dir=self.cache_dir).exists())
+
+        with mock.patch(
+            "psellos_builder.validators.bundle.load_referenced_schema",
+            side_effect=AssertionError("referenced schema was re-read"),
+        ):
+            second = load_schema_bundle(self.spec_path, cache_dir=self.cache_dir)
+            core = second.retrieve(CORE_SCHEMA["$id"])
+        self.assertEqual(first.digest, second.digest)
+        self.assertEqual(CORE_SCHEMA, core)
+
+    def test_changed_reference_invalidates_bundle(self) -> None:
+        first = load_schema_bundle(self.spec_path, cache_dir=self.cache_dir)
+        changed = copy.deepcopy(CORE_SCHEMA)
+        changed["$defs"]["id"]["minLength"] = 10
+        self.core_path.write_text(json.dumps(changed), encoding="utf-8")
+
+        second = load_schema_bundle(self.spec_path, cache_dir=self.cache_dir)
+        self.assertNotEqual(first.digest, second.digest)
+        self.assertEqual(changed, second.retrieve(CORE_SCHEMA["$id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.builders.search import build_search_index, normalize_name
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_normalize_name_strips_polytonic_diacritics(self) -> None:
+        self.assertEqual("μιχαηλ ψελλοσ", normalize_name("Μιχαὴλ  Ψελλός"))
+        self.assertEqual("anna komnene", normalize_name("Ánna-Komnēnē"))
+
+    def test_index_covers_all_name_variants(self) -> None:
+        persons = [
+            {
+                "id": "P1",
+                "name": "Michael Psellos",
+                "names": [{"value": "Μιχαὴλ Ψελλός"}, "Konstantinos"],
+            },
+            {"id": "P2", "label": "Anna Komnene"},
+        ]
+
+        index = build_search_index(persons)
+
+        prefix = index["prefix"]
+        self.assertEqual(["P1"], prefix["ψε"]["terms"]["ψελλοσ"])
+        self.assertEqual(["P1"], prefix["ko"]["terms"]["konstantinos"])
+        self.assertEqual(["P2"], prefix["ko"]["terms"]["komnene"])
+        self.assertEqual("Michael Psellos", prefix["ko"]["names"]["P1"])
+        self.assertEqual(["P2"], index["trigram"]["mn"]["terms"]["mne"])
+        self.assertEqual(
+            "prefix/cf88ceb5.json", index["directory"]["prefix_shards"]["ψε"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import gzip
+import json
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.request
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.server import DistIndex, create_server
+
+from helpers import write_dataset
+
+
+class QueryServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        dist_path = Path(self._temp_dir.name)
+        dataset = {
+            "persons": [
+                {"id": "P1", "name": "Alexios"},
+                {"id": "P2", "name": "Anna"},
+                {"id": "P3", "name": "Eirene"},
+                *({"id": f"X{index}", "name": f"Extra {index}"} for index in range(40)),
+            ],
+            "assertions": [
+                {"id": "A1", "subject": "P1", "object": "P2"},
+                {
+                    "id": "A2",
+                    "subject": "P3",
+                    "object": "P2",
+                    "extensions": {"psellos": {"layer": "alt"}},
+                },
+            ],
+        }
+        write_dataset(dist_path, dataset)
+        self.server = create_server(dist_path=dist_path, port=0, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._temp_dir.cleanup()
+
+    def _get(self, path: str, headers: dict | None = None):
+        request = urllib.request.Request(self.base_url + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, dict(exc.headers), exc.read()
+
+    def test_neighborhood_lookup_by_layer(self) -> None:
+        status, _, body = self._get("/persons/P2/neighborhood?layer=alt")
+
+        self.assertEqual(200, status)
+        payload = json.loads(body)
+        self.assertEqual(["A2"], [entry["id"] for entry in payload["assertions"]])
+        self.assertEqual({"P3": "Eirene"}, payload["neighbors"])
+
+    def test_etag_revalidation_and_gzip(self) -> None:
+        status, headers, _ = self._get("/layers/canon")
+        self.assertEqual(200, status)
+
+        status, _, _ = self._get("/layers/canon", {"If-None-Match": headers["ETag"]})
+        self.assertEqual(304, status)
+
+        status, headers, body = self._get("/manifest", {"Accept-Encoding": "gzip"})
+        self.assertEqual("gzip", headers["Content-Encoding"])
+        self.assertEqual(43, json.loads(gzip.decompress(body))["counts"]["persons"])
+        self.assertIn("X0", json.loads(gzip.decompress(body))["person_index"])
+
+    def test_unknown_person_is_not_found(self) -> None:
+        status, _, body = self._get("/persons/P9")
+
+        self.assertEqual(404, status)
+        self.assertIn("P9", json.loads(body)["error"])
+
+
+
+class LeanDistIndexTests(unittest.TestCase):
+    def test_assertion_lookup_restores_detail_fields(self) -> None:
+        assertion = {
+            "id": "A1",
+            "subject": "P1",
+            "object": "P2",
+            "predicate": "knows",
+            "source": {"citation": "Alexiad 1.1"},
+        }
+        dataset = {
+            "persons": [{"id": "P1", "name": "Alexios"}, {"id": "P2", "name": "Anna"}],
+            "assertions": [assertion],
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dist_path = Path(temp_dir)
+            write_dataset(dist_path, dataset, projection="lean")
+            index = DistIndex(dist_path)
+
+        self.assertEqual(assertion, index.assertion("A1"))
+        neighborhood = index.neighborhood("P1", None)
+        self.assertEqual("lean", neighborhood["projection"])
+        self.assertNotIn("source", neighborhood["assertions"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
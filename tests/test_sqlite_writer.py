@@ -0,0 +1,68 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from psellos_builder.exporters.sqlite_writer import write_sqlite
+
+from helpers import manifest_for
+
+
+class SqliteExportTests(unittest.TestCase):
+    def test_assertions_are_queryable_by_person_layer_and_rel(self) -> None:
+        dataset = {
+            "persons": [
+                {"id": "P1", "name": "Alexios"},
+                {"id": "P2", "name": "Anna"},
+            ],
+            "assertions": [
+                {
+                    "id": "A1",
+                    "subject": {"id": "P1"},
+                    "object": "P2",
+                    "predicate": "parent_of",
+                    "extensions": {"psellos": {"rel": "genealogy"}},
+                },
+                {
+                    "id": "A2",
+                    "subject": "P2",
+                    "object": "P1",
+                    "extensions": {"psellos": {"layer": "alt"}},
+                },
+            ],
+        }
+        manifest = manifest_for(dataset)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "psellos.sqlite"
+            write_sqlite(db_path=db_path, manifest=manifest, dataset=dataset)
+
+            connection = sqlite3.connect(db_path)
+            try:
+                rows = connection.execute(
+                    "SELECT assertion_id, role FROM assertion_endpoints"
+                    " WHERE person_id = ? AND layer = ? AND rel = ?",
+                    ("P2", "canon", "genealogy"),
+                ).fetchall()
+                alt = connection.execute(
+                    "SELECT id, rel, subject FROM assertions WHERE layer = 'alt'"
+                ).fetchall()
+                counts = connection.execute(
+                    "SELECT value FROM meta WHERE key = 'counts'"
+                ).fetchone()
+                name = connection.execute(
+                    "SELECT display_name FROM persons WHERE id = 'P2'"
+                ).fetchone()
+            finally:
+                connection.close()
+
+        self.assertEqual([("A1", "object")], rows)
+        self.assertEqual([("A2", "(none)", "P2")], alt)
+        self.assertEqual(('{"assertions":2,"persons":2}',), counts)
+        self.assertEqual(("Anna",), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
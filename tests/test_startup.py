@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative import time budget for the CLI entry point, in microseconds. A warm
+# import takes about 30 ms, while eagerly importing jsonschema or the exporters
+# pushes it well past the default; PSELLOS_CLI_IMPORT_BUDGET_US overrides it.
+CLI_IMPORT_BUDGET_ENV = "PSELLOS_CLI_IMPORT_BUDGET_US"
+DEFAULT_CLI_IMPORT_BUDGET_US = 150_000
+DEFERRED_MODULES = (
+    "jsonschema",
+    "referencing",
+    "importlib.metadata",
+    "concurrent.futures",
+    "sqlite3",
+    "psellos_builder.builders.compile",
+    "psellos_builder.validators.compiler",
+    "psellos_builder.exporters.dist_writer",
+    "psellos_builder.exporters.sqlite_writer",
+    "psellos_builder.loaders",
+    "multiprocessing",
+)
+
+
+def _import_times(module: str) -> dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _imported_modules(module: str) -> set[str]:
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class StartupTests(unittest.TestCase):
+    def test_cli_import_leaves_heavy_modules_unloaded(self) -> None:
+        modules = _imported_modules("psellos_builder.cli")
+        self.assertIn("psellos_builder.cli", modules)
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, modules)
+
+    def test_cli_import_defers_build_dependencies(self) -> None:
+        times = _import_times("psellos_builder.cli")
+        for module in DEFERRED_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, times)
+        budget = int(
+            os.environ.get(CLI_IMPORT_BUDGET_ENV, DEFAULT_CLI_IMPORT_BUDGET_US)
+        )
+        self.assertLess(times["psellos_builder.cli"], budget)
+
+
+if __name__ == "__main__":
+    unittest.main()